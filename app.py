@@ -1,468 +1,2050 @@
-import os, io, json
-from flask import Flask, render_template_string, request, send_file, redirect, url_for, session
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from datetime import datetime
-
-app = Flask(__name__)
-app.secret_key = "mehedi_thai_final_v10"
-
-# ---- ফিক্সড ক্রেডেনশিয়ালস ----
-USER_LOGIN = "Mehedihasan"
-USER_PASS = "1234"
-
-# ---- ডাটা স্টোরেজ (মেমোরি) ----
-data_store = {
-    "customers": [
-        {"n": "Walk-in Customer", "m": "01xxxxxxxxx"}
-    ],
-    "products": [
-        "Thai Window 4\" (Silver)", 
-        "Thai Window 4\" (Bronze)", 
-        "5mm Clear Glass", 
-        "5mm Blue Mercury Glass", 
-        "Sliding Door", 
-        "SS Grill Piece", 
-        "Thai Mosquito Net"
-    ]
-}
-
-# ---- হেল্পার ফাংশন ----
-def safe_float(val):
-    if not val: return 0.0
-    try: return float(val)
-    except: return 0.0
-
-def safe_int(val):
-    if not val: return 0
-    try: return int(val)
-    except: return 0
-
-# ---- ১. PDF জেনারেটর (আপনার ফিক্সড ডিজাইন) ----
-def generate_pdf(items_list, doc_type, c_name, c_mob, advance, note):
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-    
-    # --- হেডার ---
-    c.setFont("Helvetica-Bold", 24)
-    c.drawCentredString(width/2, height - 50, "MEHEDI THAI ALUMINUM & GLASS")
-    c.setFont("Helvetica", 9.5) # ফন্ট সাইজ বাড়ানো হয়েছে
-    c.drawCentredString(width/2, height - 65, "West Side Of The Khartoil Boro Mosjid, Satiash Road, Tongi, Gazipur, 1700.")
-    c.setFont("Helvetica-Oblique", 10.5) # ফন্ট সাইজ বাড়ানো হয়েছে
-    c.drawCentredString(width/2, height - 82, "Modern design, durable materials & fast delivery with 100% guarantee.")
-
-    # --- প্রোপাইটর এবং মোবাইল (পাশাপাশি - ফিক্সড) ---
-    c.setFont("Helvetica-Bold", 11)
-    c.drawString(40, height - 110, "Proprietor: ABDUL HANNAN")
-    
-    c.setFont("Helvetica", 10)
-    # নম্বরগুলো পাশাপাশি
-    c.drawString(40, height - 125, "Mobile: +880 1811-179656,  +880 1601-465130,  +880 1967-113830")
-    
-    # প্রোপাইটরের নিচে দাগ (হেডারের নিচে নয়)
-    c.setLineWidth(0.8)
-    c.line(40, height - 135, 555, height - 135)
-
-    # --- তারিখ ও নং ---
-    curr_date = datetime.now().strftime("%d/%m/%Y")
-    c.setFont("Helvetica-Bold", 10)
-    c.drawRightString(555, height - 110, f"Date: {curr_date}")
-    c.drawRightString(555, height - 125, f"{doc_type} No: #200")
-
-    # --- কাস্টমার তথ্য ---
-    c.setFont("Helvetica-Bold", 10)
-    c.drawString(40, height - 155, f"Customer Name: {c_name}")
-    c.drawString(40, height - 170, f"Mobile: {c_mob}")
-
-    # --- টেবিল হেডার ---
-    x_coords = [40, 310, 370, 420, 480, 555]
-    curr_y = height - 190
-    table_top = curr_y
-    
-    c.setFont("Helvetica-Bold", 9)
-    headers = ["DESCRIPTION", "SQ.FT", "QTY", "RATE", "TOTAL"]
-    for i, h in enumerate(headers):
-        c.drawCentredString((x_coords[i]+x_coords[i+1])/2, curr_y - 14, h)
-    
-    curr_y -= 20
-    c.setLineWidth(1)
-    c.line(40, curr_y, 555, curr_y) # হেডারের নিচের দাগ
-
-    grand_total = 0
-    
-    # --- আইটেম লুপ ---
-    for i, item in enumerate(items_list):
-        t_val = safe_float(item['total'])
-        grand_total += t_val
-        text_y = curr_y - 15
-        
-        # SL নং টাইটেলের আগে (1. Window)
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(45, text_y, f"{i+1}. {item['title']}")
-        
-        # মাপ ও হিসাব (Centered)
-        c.setFont("Helvetica", 10)
-        c.drawCentredString((x_coords[1]+x_coords[2])/2, text_y, str(item['feet']) if safe_float(item['feet']) > 0 else "-")
-        c.drawCentredString((x_coords[2]+x_coords[3])/2, text_y, str(item['pcs']) if safe_int(item['pcs']) > 0 else "-")
-        c.drawCentredString((x_coords[3]+x_coords[4])/2, text_y, str(item['rate']) if safe_float(item['rate']) > 0 else "-")
-        c.drawRightString(550, text_y, f"{t_val:.0f}")
-        
-        curr_y = text_y - 5
-        
-        # বিবরণ থাকলে তীর ও ব্র্যাকেট
-        if item.get('desc') and item['desc'].strip():
-            # --- তীর চিহ্ন (Arrow) ---
-            arrow_x = 60
-            c.setLineWidth(0.8)
-            c.line(arrow_x, curr_y, arrow_x, curr_y - 10) # সোজা দাগ
-            # তীরের মাথা
-            c.line(arrow_x, curr_y - 10, arrow_x - 3, curr_y - 7)
-            c.line(arrow_x, curr_y - 10, arrow_x + 3, curr_y - 7)
-            
-            c.setFont("Helvetica", 10.5) # বড় ফন্ট
-            lines = item['desc'].split('\n')
-            list_y = curr_y - 20
-            start_l_y = list_y + 10
-            max_w = 0
-            
-            for line in lines:
-                c.drawString(70, list_y, line)
-                w = c.stringWidth(line, "Helvetica", 10.5)
-                if w > max_w: max_w = w
-                list_y -= 14
-            
-            # --- অতি চিকন ব্র্যাকেট (0.3) ---
-            c.setLineWidth(0.3)
-            c.setStrokeColorRGB(0.3, 0.3, 0.3)
-            
-            # বাম ব্র্যাকেট [
-            c.line(60, start_l_y, 55, start_l_y)
-            c.line(55, start_l_y, 55, list_y+5)
-            c.line(55, list_y+5, 60, list_y+5)
-            
-            # ডান ব্র্যাকেট ]
-            rx = 70 + max_w + 10
-            c.line(rx-5, start_l_y, rx, start_l_y)
-            c.line(rx, start_l_y, rx, list_y+5)
-            c.line(rx, list_y+5, rx-5, list_y+5)
-            
-            c.setStrokeColorRGB(0,0,0)
-            curr_y = list_y - 5
-        else:
-            curr_y -= 10
-
-    # --- টেবিলের সলিড দাগ (লুপের শেষে) ---
-    c.setLineWidth(1)
-    for x in x_coords: c.line(x, table_top, x, curr_y)
-    c.line(40, table_top, 555, table_top)
-    c.line(40, curr_y, 555, curr_y)
-
-    # --- হিসাব বক্স (আলাদা) ---
-    summary_y = curr_y - 30
-    c.setLineWidth(1.2)
-    c.rect(400, summary_y, 155, 25); c.setFont("Helvetica-Bold", 11)
-    c.drawString(405, summary_y+7, "Grand Total:"); c.drawRightString(550, summary_y+7, f"{grand_total:,.0f} Tk")
-    
-    if doc_type == "Invoice":
-        summary_y -= 25; c.rect(400, summary_y, 155, 25)
-        c.drawString(405, summary_y+7, "Advance:"); c.drawRightString(550, summary_y+7, f"{advance:,.0f} Tk")
-        summary_y -= 25; c.rect(400, summary_y, 155, 25)
-        c.drawString(405, summary_y+7, "Due:"); c.drawRightString(550, summary_y+7, f"{grand_total-advance:,.0f} Tk")
-
-    # --- নোট বক্স ---
-    if note:
-        c.setLineWidth(0.8)
-        c.rect(40, summary_y-10, 320, 40)
-        c.setFont("Helvetica-Bold", 10); c.drawString(45, summary_y+15, "Note:")
-        c.setFont("Helvetica", 9); c.drawString(45, summary_y+2, note)
-
-    # --- সিগনেচার (দাগ উপরে) ---
-    c.setLineWidth(0.8)
-    c.line(40, 60, 160, 60); c.drawString(45, 45, "Customer Signature")
-    c.line(435, 60, 555, 60); c.drawRightString(550, 45, "Authorized Signature")
-    
-    c.save(); buffer.seek(0)
-    return buffer
-
-# ---- ২. ফ্রন্টএন্ড লেআউট ----
-LAYOUT = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Mehedi Thai Admin</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-    <script src="https://code.jquery.com/jquery-3.6.0.min.js"></script>
-    <style>
-        body { background: #f0f2f5; font-family: 'Segoe UI', sans-serif; }
-        .sidebar { height: 100vh; background: #0f172a; color: white; position: fixed; width: 250px; }
-        .sidebar a { color: #cbd5e1; text-decoration: none; padding: 15px 25px; display: block; border-bottom: 1px solid #1e293b; }
-        .sidebar a:hover { background: #334155; color: white; }
-        .main { margin-left: 250px; padding: 30px; }
-        .card { border: none; box-shadow: 0 4px 6px -1px rgba(0,0,0,0.1); border-radius: 8px; }
-        .step-section { display: none; }
-        .step-section.active { display: block; animation: fadeIn 0.3s; }
-        .wiz-step { display: none; }
-        @keyframes fadeIn { from { opacity: 0; } to { opacity: 1; } }
-    </style>
-</head>
-<body>
-    {% if session.logged_in %}
-    <div class="sidebar">
-        <h4 class="text-center py-4 text-white">Mehedi Thai</h4>
-        <a href="/dashboard">📊 Dashboard</a>
-        <a href="/customers">👥 Customers</a>
-        <a href="/products">📦 Products</a>
-        <a href="/create/Invoice">🧾 Create Invoice</a>
-        <a href="/create/Quotation">📄 Create Quotation</a>
-        <a href="/logout" class="text-danger mt-5">🚪 Logout</a>
-    </div>
-    {% endif %}
-    <div class="main">{% block content %}{% endblock %}</div>
-
-    <script>
-        // কাস্টমার ডাটাবেজ
-        const customers = {{ customers_json | safe }}; 
-        
-        // কাস্টমার সিলেকশন লজিক
-        function checkCustomer() {
-            const inputName = document.getElementById('cust_input').value;
-            const found = customers.find(c => c.n === inputName);
-            if(found) {
-                document.getElementById('cust_mobile').value = found.m;
-            }
-        }
-
-        // কাস্টমার কনফার্ম করে আইটেমে যাওয়া
-        function confirmCustomer() {
-            const name = document.getElementById('cust_input').value;
-            const mobile = document.getElementById('cust_mobile').value;
-            
-            if(!name || !mobile) { alert("Customer Name and Mobile are required!"); return; }
-            
-            document.getElementById('final_c_name').value = name;
-            document.getElementById('final_c_mob').value = mobile;
-            document.getElementById('display_c_name').innerText = name;
-            document.getElementById('display_c_mob').innerText = mobile;
-
-            document.getElementById('section_customer').classList.remove('active');
-            document.getElementById('section_items').classList.add('active');
-        }
-
-        // আইটেম উইজার্ড স্টেপ কন্ট্রোল
-        function showItemStep(id) {
-            document.querySelectorAll('.wiz-step').forEach(el => el.style.display = 'none');
-            document.getElementById(id).style.display = 'block';
-        }
-
-        // আইটেম লিস্ট
-        let itemList = [];
-
-        function saveItem() {
-            const title = document.getElementById('i_title').value;
-            const desc = document.getElementById('i_desc').value;
-            const feet = parseFloat(document.getElementById('i_feet').value) || 0;
-            const pcs = parseInt(document.getElementById('i_pcs').value) || 0;
-            const rate = parseFloat(document.getElementById('i_rate').value) || 0;
-            const manual = parseFloat(document.getElementById('i_manual').value) || 0;
-
-            if(!title) { alert("Title is required"); return; }
-            if(feet==0 && pcs==0 && manual==0) { alert("Please enter Feet, Pcs or Manual Total"); return; }
-
-            let total = 0;
-            if(rate > 0) total = (feet > 0 ? feet : pcs) * rate;
-            else total = manual;
-
-            itemList.push({title, desc, feet, pcs, rate, total});
-            renderTable();
-            
-            // ইনপুট রিসেট
-            document.getElementById('i_title').value='';
-            document.getElementById('i_desc').value='';
-            document.getElementById('i_feet').value='';
-            document.getElementById('i_pcs').value='';
-            document.getElementById('i_rate').value='';
-            document.getElementById('i_manual').value='';
-            
-            // প্রথম স্টেপে ফেরত
-            showItemStep('step_1');
-        }
-
-        function renderTable() {
-            let html = '';
-            let gTotal = 0;
-            itemList.forEach((it, idx) => {
-                gTotal += it.total;
-                html += `<tr><td>${idx+1}</td><td><b>${it.title}</b></td><td>${it.total.toFixed(0)}</td></tr>`;
-            });
-            document.getElementById('item_tbody').innerHTML = html;
-            document.getElementById('g_total_disp').innerText = gTotal.toFixed(0);
-            document.getElementById('hidden_json').value = JSON.stringify(itemList);
-        }
-    </script>
-</body>
-</html>
-"""
-
-# ---- ৩. রাউটস ----
-@app.route('/')
-def index(): return redirect(url_for('dashboard'))
-
-@app.route('/login', methods=['GET', 'POST'])
-def login():
-    if request.method == 'POST':
-        if request.form['user'] == USER_LOGIN and request.form['pass'] == USER_PASS:
-            session['logged_in'] = True; return redirect(url_for('dashboard'))
-    return render_template_string(LAYOUT.replace('{% block content %}{% endblock %}', """
-        <div class="d-flex justify-content-center align-items-center" style="height: 80vh;">
-            <div class="card p-5 shadow" style="width: 400px;">
-                <h3 class="text-center mb-4">Admin Login</h3>
-                <form method="POST">
-                    <input name="user" class="form-control mb-3" placeholder="Username" required>
-                    <input name="pass" type="password" class="form-control mb-4" placeholder="Password" required>
-                    <button class="btn btn-primary w-100">Login</button>
-                </form>
-            </div>
-        </div>
-    """), customers_json="[]")
-
-@app.route('/dashboard')
-def dashboard():
-    if not session.get('logged_in'): return redirect(url_for('login'))
-    return render_template_string(LAYOUT.replace('{% block content %}{% endblock %}', f"""
-        <h2>Dashboard</h2>
-        <div class="row g-4 mt-2">
-            <div class="col-md-4"><div class="card p-4 bg-primary text-white"><h5>Products</h5><h2>{len(data_store['products'])}</h2></div></div>
-            <div class="col-md-4"><div class="card p-4 bg-success text-white"><h5>Customers</h5><h2>{len(data_store['customers'])}</h2></div></div>
-        </div>
-    """), customers_json="[]")
-
-@app.route('/create/<doc_type>', methods=['GET', 'POST'])
-def create(doc_type):
-    if not session.get('logged_in'): return redirect(url_for('login'))
-    
-    if request.method == 'POST':
-        try:
-            items = json.loads(request.form.get('items_data', '[]'))
-            adv = safe_float(request.form.get('adv'))
-            pdf = generate_pdf(items, doc_type, request.form['c_name'], request.form['c_mob'], adv, request.form['note'])
-            return send_file(pdf, download_name=f"{doc_type}.pdf", as_attachment=True)
-        except Exception as e: return f"Error: {e}"
-
-    cust_json = json.dumps(data_store['customers'])
-    cust_opts = "".join([f"<option value='{c['n']}'>" for c in data_store['customers']])
-    prod_opts = "".join([f"<option value='{p}'>" for p in data_store['products']])
-    
-    html_content = f"""
-    <div id="section_customer" class="step-section active">
-        <div class="card p-5 shadow-sm" style="max-width: 600px; margin: auto;">
-            <h3 class="mb-4 text-center">Step 1: Select Customer</h3>
-            
-            <div class="mb-3">
-                <label class="form-label">Customer Name</label>
-                <input id="cust_input" class="form-control form-control-lg" list="c_list" oninput="checkCustomer()" placeholder="Type to search or add new...">
-                <datalist id="c_list">{cust_opts}</datalist>
-            </div>
-
-            <div class="mb-4">
-                <label class="form-label">Mobile Number</label>
-                <input id="cust_mobile" class="form-control form-control-lg" placeholder="Enter mobile number">
-            </div>
-
-            <button onclick="confirmCustomer()" class="btn btn-primary btn-lg w-100">Next: Add Items &rarr;</button>
-        </div>
-    </div>
-
-    <div id="section_items" class="step-section">
-        <div class="row">
-            <div class="col-md-7">
-                <div class="card p-4 border-primary">
-                    <div class="d-flex justify-content-between mb-3">
-                        <h5>Add Item to {doc_type}</h5>
-                        <span class="badge bg-info text-dark">Wizard</span>
-                    </div>
-
-                    <div id="step_1" class="wiz-step" style="display:block;">
-                        <label class="form-label fw-bold">1. Select Product</label>
-                        <input id="i_title" class="form-control form-control-lg mb-3" list="p_list" placeholder="Select product...">
-                        <datalist id="p_list">{prod_opts}</datalist>
-                        <button class="btn btn-primary w-100" onclick="showItemStep('step_2')">Next: Description &rarr;</button>
-                    </div>
-
-                    <div id="step_2" class="wiz-step">
-                        <label class="form-label fw-bold">2. Description (Optional)</label>
-                        <textarea id="i_desc" class="form-control mb-3" rows="3" placeholder="Enter details..."></textarea>
-                        <div class="d-flex gap-2">
-                            <button class="btn btn-secondary w-50" onclick="showItemStep('step_1')">&larr; Back</button>
-                            <button class="btn btn-primary w-50" onclick="showItemStep('step_3')">Next: Price &rarr;</button>
-                        </div>
-                    </div>
-
-                    <div id="step_3" class="wiz-step">
-                        <label class="form-label fw-bold">3. Price Calculation</label>
-                        <div class="row g-2 mb-3">
-                            <div class="col-4"><label>Sq.Ft</label><input id="i_feet" type="number" class="form-control"></div>
-                            <div class="col-4"><label>Qty</label><input id="i_pcs" type="number" class="form-control"></div>
-                            <div class="col-4"><label>Rate</label><input id="i_rate" type="number" class="form-control"></div>
-                        </div>
-                        <label>Manual Total (Use if Rate is empty)</label>
-                        <input id="i_manual" type="number" class="form-control mb-3" placeholder="Manual amount">
-                        
-                        <div class="d-flex gap-2">
-                            <button class="btn btn-secondary w-50" onclick="showItemStep('step_2')">&larr; Back</button>
-                            <button class="btn btn-success w-50" onclick="saveItem()">+ Add to List</button>
-                        </div>
-                    </div>
-                </div>
-            </div>
-
-            <div class="col-md-5">
-                <div class="card p-4 h-100">
-                    <h5>Preview</h5>
-                    <div class="alert alert-light border p-2 mb-2">
-                        <strong>Name:</strong> <span id="display_c_name"></span><br>
-                        <strong>Mobile:</strong> <span id="display_c_mob"></span>
-                    </div>
-                    
-                    <div style="flex-grow: 1; overflow-y: auto; max-height: 300px;">
-                        <table class="table table-sm table-striped">
-                            <thead><tr><th>#</th><th>Item</th><th>Total</th></tr></thead>
-                            <tbody id="item_tbody"></tbody>
-                        </table>
-                    </div>
-                    
-                    <h4 class="text-end border-top pt-2">Total: <span id="g_total_disp">0</span></h4>
-                    
-                    <form method="POST" class="mt-3">
-                        <input type="hidden" name="c_name" id="final_c_name">
-                        <input type="hidden" name="c_mob" id="final_c_mob">
-                        <input type="hidden" name="items_data" id="hidden_json">
-                        
-                        {f'<input name="adv" type="number" class="form-control mb-2" placeholder="Advance Payment">' if doc_type == 'Invoice' else ''}
-                        <input name="note" class="form-control mb-2" placeholder="Note (Warranty/Conditions)">
-                        
-                        <button class="btn btn-dark w-100 py-2">Download PDF</button>
-                    </form>
-                </div>
-            </div>
-        </div>
-    </div>
-    """
-    return render_template_string(LAYOUT.replace('{% block content %}{% endblock %}', html_content), customers_json=cust_json)
-
-@app.route('/customers', methods=['GET', 'POST'])
-def customers():
-    if request.method == 'POST': data_store['customers'].append({'n': request.form['n'], 'm': request.form['m']})
-    c_list = "".join([f"<li class='list-group-item'>{c['n']} - {c['m']}</li>" for c in data_store['customers']])
-    return render_template_string(LAYOUT.replace('{% block content %}{% endblock %}', f"<h3>Customers</h3><form method='post' class='mb-3'><input name='n' placeholder='Name' class='form-control mb-2'><input name='m' placeholder='Mobile' class='form-control mb-2'><button class='btn btn-success'>Add</button></form><ul class='list-group'>{c_list}</ul>"), customers_json="[]")
-
-@app.route('/products', methods=['GET', 'POST'])
-def products():
-    if request.method == 'POST': data_store['products'].append(request.form['p'])
-    p_list = "".join([f"<li class='list-group-item'>{p}</li>" for p in data_store['products']])
-    return render_template_string(LAYOUT.replace('{% block content %}{% endblock %}', f"<h3>Products</h3><form method='post' class='mb-3'><input name='p' placeholder='Product Name' class='form-control mb-2'><button class='btn btn-primary'>Add</button></form><ul class='list-group'>{p_list}</ul>"), customers_json="[]")
-
-if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
-
+import os, io, csv, json, sqlite3, threading, bisect, zipfile, hashlib, uuid, time, zlib, gzip
+from collections import OrderedDict
+from concurrent.futures import wait, FIRST_COMPLETED
+from functools import lru_cache
+from flask import Flask, render_template, request, send_file, redirect, url_for, session, jsonify, Response, stream_with_context, g
+from jinja2 import DictLoader
+from markupsafe import Markup
+from datetime import datetime
+try:
+    import brotli # ঐচ্ছিক; না থাকলে শুধু gzip
+except ImportError:
+    brotli = None
+
+app = Flask(__name__, static_folder=None) # স্ট্যাটিক ফাইল নিচের হ্যাশ-নামের রাউট দিয়ে
+app.secret_key = "mehedi_thai_final_v10"
+
+# ---- ফিক্সড ক্রেডেনশিয়ালস ----
+USER_LOGIN = "Mehedihasan"
+USER_PASS = "1234"
+
+# ---- ডাটা স্টোরেজ (SQLite, WAL মোড - সব gunicorn ওয়ার্কার একই ফাইল শেয়ার করে) ----
+DB_PATH = os.environ.get('DB_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mehedi_thai.db'))
+
+DEFAULT_CUSTOMERS = [
+    {"n": "Walk-in Customer", "m": "01xxxxxxxxx"}
+]
+DEFAULT_PRODUCTS = [
+    "Thai Window 4\" (Silver)", 
+    "Thai Window 4\" (Bronze)", 
+    "5mm Clear Glass", 
+    "5mm Blue Mercury Glass", 
+    "Sliding Door", 
+    "SS Grill Piece", 
+    "Thai Mosquito Net"
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS customers (id INTEGER PRIMARY KEY, n TEXT NOT NULL, m TEXT NOT NULL, m_key TEXT);
+CREATE INDEX IF NOT EXISTS idx_customers_m ON customers(m);
+CREATE INDEX IF NOT EXISTS idx_customers_n ON customers(n COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS products (id INTEGER PRIMARY KEY, name TEXT NOT NULL, name_key TEXT);
+CREATE INDEX IF NOT EXISTS idx_products_name ON products(name COLLATE NOCASE);
+
+-- টেবিল বদলালেই ভার্সন বাড়ে; ওয়ার্কাররা এটা দেখে নিজেদের মেমোরি ইনডেক্স রিফ্রেশ করে
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('customers', 0), ('products', 0);
+CREATE TRIGGER IF NOT EXISTS customers_ins AFTER INSERT ON customers BEGIN UPDATE meta SET value = value + 1 WHERE key = 'customers'; END;
+CREATE TRIGGER IF NOT EXISTS customers_upd AFTER UPDATE ON customers BEGIN UPDATE meta SET value = value + 1 WHERE key = 'customers'; END;
+CREATE TRIGGER IF NOT EXISTS customers_del AFTER DELETE ON customers BEGIN UPDATE meta SET value = value + 1 WHERE key = 'customers'; END;
+CREATE TRIGGER IF NOT EXISTS products_ins AFTER INSERT ON products BEGIN UPDATE meta SET value = value + 1 WHERE key = 'products'; END;
+CREATE TRIGGER IF NOT EXISTS products_upd AFTER UPDATE ON products BEGIN UPDATE meta SET value = value + 1 WHERE key = 'products'; END;
+CREATE TRIGGER IF NOT EXISTS products_del AFTER DELETE ON products BEGIN UPDATE meta SET value = value + 1 WHERE key = 'products'; END;
+
+CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, doc_type TEXT NOT NULL, created REAL NOT NULL, pdf BLOB, error TEXT);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created);
+
+CREATE TABLE IF NOT EXISTS doc_counters (doc_type TEXT PRIMARY KEY, last INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY, doc_type TEXT NOT NULL, doc_no INTEGER NOT NULL, token TEXT NOT NULL UNIQUE,
+    c_name TEXT NOT NULL, c_mob TEXT NOT NULL, m_key TEXT, doc_date TEXT NOT NULL, advance REAL NOT NULL, note TEXT NOT NULL,
+    grand_total REAL NOT NULL, items BLOB NOT NULL, status TEXT NOT NULL DEFAULT 'open', UNIQUE (doc_type, doc_no)
+);
+CREATE INDEX IF NOT EXISTS idx_documents_date ON documents(doc_date);
+CREATE INDEX IF NOT EXISTS idx_documents_type ON documents(doc_type);
+
+-- বিক্রির যোগফল (ডকুমেন্ট ফাইনাল / বাতিল হওয়ার সময় আপডেট, documents থেকে যেকোনো সময় রিবিল্ড করা যায়)
+CREATE TABLE IF NOT EXISTS sales_totals (doc_type TEXT PRIMARY KEY, docs INTEGER NOT NULL, total REAL NOT NULL, advance REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS sales_daily (
+    doc_type TEXT NOT NULL, day TEXT NOT NULL, docs INTEGER NOT NULL, total REAL NOT NULL, advance REAL NOT NULL, PRIMARY KEY (doc_type, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sales_monthly (
+    doc_type TEXT NOT NULL, month TEXT NOT NULL, docs INTEGER NOT NULL, total REAL NOT NULL, advance REAL NOT NULL, PRIMARY KEY (doc_type, month)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sales_customers (
+    doc_type TEXT NOT NULL, c_key TEXT NOT NULL, c_name TEXT NOT NULL, c_mob TEXT NOT NULL,
+    docs INTEGER NOT NULL, total REAL NOT NULL, advance REAL NOT NULL, PRIMARY KEY (doc_type, c_key)
+);
+CREATE INDEX IF NOT EXISTS idx_sales_customers_due ON sales_customers(doc_type, total - advance);
+CREATE TABLE IF NOT EXISTS sales_products (
+    doc_type TEXT NOT NULL, p_key TEXT NOT NULL, name TEXT NOT NULL, lines INTEGER NOT NULL, pcs INTEGER NOT NULL, total REAL NOT NULL,
+    PRIMARY KEY (doc_type, p_key)
+);
+CREATE INDEX IF NOT EXISTS idx_sales_products_total ON sales_products(doc_type, total);
+
+CREATE TABLE IF NOT EXISTS drafts (
+    id TEXT PRIMARY KEY, doc_type TEXT NOT NULL, c_name TEXT NOT NULL, c_mob TEXT NOT NULL, advance REAL NOT NULL DEFAULT 0,
+    note TEXT NOT NULL DEFAULT '', total REAL NOT NULL DEFAULT 0, n_items INTEGER NOT NULL DEFAULT 0, updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_drafts_updated ON drafts(updated);
+CREATE TABLE IF NOT EXISTS draft_items (
+    id INTEGER PRIMARY KEY, draft_id TEXT NOT NULL, pos REAL NOT NULL, title TEXT NOT NULL, description TEXT NOT NULL,
+    feet NUMERIC NOT NULL, pcs INTEGER NOT NULL, rate NUMERIC NOT NULL, total NUMERIC NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_draft_items_pos ON draft_items(draft_id, pos);
+"""
+
+_local = threading.local()
+
+def db():
+    # প্রতি থ্রেডে একটা কানেকশন; fork হলে (pid বদলালে) নতুন কানেকশন
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.pid != os.getpid():
+        conn = sqlite3.connect(DB_PATH, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL") # ডকুমেন্ট নম্বর বিদ্যুৎ চলে গেলেও হারাবে না
+        conn.execute("PRAGMA busy_timeout=10000")
+        _local.conn, _local.pid = conn, os.getpid()
+    return conn
+
+def close_db():
+    # এই থ্রেডের কানেকশন বন্ধ; পরের db() নতুন করে খোলে
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        conn.close(); del _local.conn
+
+SCHEMA_VERSION = 6
+
+def digits(val):
+    return "".join(ch for ch in val if ch.isdigit())
+
+def mobile_key(m):
+    # ডুপ্লিকেট ধরার জন্য মোবাইল নম্বরের একটাই রূপ: +880 1711-000000 / 8801711000000 / 1711000000 -> 01711000000
+    d = digits(m or "")
+    if d.startswith("880"): d = "0" + d[3:]
+    elif len(d) == 10 and d.startswith("1"): d = "0" + d
+    return d if len(d) >= 6 else None # অসম্পূর্ণ নম্বর (যেমন 01xxxxxxxxx) ডুপ্লিকেট চেকে ধরা হয় না
+
+def mobile_prefix(q):
+    # সার্চের অর্ধেক লেখা নম্বর mobile_key এর রূপে: +880 19 / 88019 / 19 -> 019
+    # শুধু ফোন নম্বরের মতো লেখা (অঙ্ক, +, - আর স্পেস, অন্তত ৩টা অঙ্ক) হলে; "Flat 1" এর মতো নামের অঙ্ক নম্বর নয়
+    q = (q or "").strip()
+    d = digits(q)
+    if len(d) < 3 or any(not (ch.isdigit() or ch in "+- ") for ch in q): return ""
+    if d.startswith("880"): d = "0" + d[3:]
+    elif d.startswith("1"): d = "0" + d
+    return d
+
+def product_key(name):
+    return " ".join((name or "").split()).casefold() or None
+
+def migrate_dedupe_keys(conn):
+    # v1 -> v2: m_key / name_key কলাম ভরাট; পুরনো ডুপ্লিকেটের প্রথমটাই কী পায়, বাকিগুলো (মুছে না ফেলে) NULL থাকে
+    for table, col, src, fn in (("customers", "m_key", "m", mobile_key), ("products", "name_key", "name", product_key)):
+        if col not in [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} TEXT")
+        seen = set()
+        for rid, val in conn.execute(f"SELECT id, {src} FROM {table} ORDER BY id").fetchall():
+            key = fn(val)
+            if key in seen: key = None
+            elif key: seen.add(key)
+            conn.execute(f"UPDATE {table} SET {col} = ? WHERE id = ?", (key, rid))
+
+def migrate_document_mobiles(conn):
+    # v3 -> v4: আর্কাইভে মোবাইল খোঁজা c_mob এর হুবহু লেখায় না, mobile_key ধরে
+    if 'm_key' not in [r[1] for r in conn.execute("PRAGMA table_info(documents)")]:
+        conn.execute("ALTER TABLE documents ADD COLUMN m_key TEXT")
+    conn.execute("DROP INDEX IF EXISTS idx_documents_mob")
+    conn.executemany("UPDATE documents SET m_key = ? WHERE id = ?", [(mobile_key(m), rid) for rid, m in conn.execute("SELECT id, c_mob FROM documents").fetchall()])
+
+def migrate_document_tokens(conn):
+    # v4 -> v5: নম্বর আর কনটেন্ট হ্যাশে না, ইস্যু token এ বাঁধা (content_key এর UNIQUE সরাতে টেবিল নতুন করে বানাতে হয়);
+    # পুরনো ডকুমেন্টের token = তার পুরনো content_key, যা আগে থেকেই ইউনিক
+    conn.execute("""CREATE TABLE documents_v5 (
+        id INTEGER PRIMARY KEY, doc_type TEXT NOT NULL, doc_no INTEGER NOT NULL, token TEXT NOT NULL UNIQUE,
+        c_name TEXT NOT NULL, c_mob TEXT NOT NULL, m_key TEXT, doc_date TEXT NOT NULL, advance REAL NOT NULL, note TEXT NOT NULL,
+        grand_total REAL NOT NULL, items BLOB NOT NULL, UNIQUE (doc_type, doc_no))""")
+    conn.execute("""INSERT INTO documents_v5 (id, doc_type, doc_no, token, c_name, c_mob, m_key, doc_date, advance, note, grand_total, items)
+        SELECT id, doc_type, doc_no, content_key, c_name, c_mob, m_key, doc_date, advance, note, grand_total, items FROM documents""")
+    conn.execute("DROP TABLE documents")
+    conn.execute("ALTER TABLE documents_v5 RENAME TO documents")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_date ON documents(doc_date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_type ON documents(doc_type)")
+
+def init_db():
+    conn = db()
+    conn.executescript(SCHEMA)
+    # নতুন ডাটাবেজ হলে ডিফল্ট ডাটা একবারই বসবে (BEGIN IMMEDIATE = ওয়ার্কারদের মধ্যে লক)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        ver = conn.execute("PRAGMA user_version").fetchone()[0]
+        if ver == 0:
+            conn.executemany("INSERT INTO customers (n, m, m_key) VALUES (?, ?, ?)", [(c['n'], c['m'], mobile_key(c['m'])) for c in DEFAULT_CUSTOMERS])
+            conn.executemany("INSERT INTO products (name, name_key) VALUES (?, ?)", [(p, product_key(p)) for p in DEFAULT_PRODUCTS])
+        elif ver < 2:
+            migrate_dedupe_keys(conn)
+        if 0 < ver < 4:
+            migrate_document_mobiles(conn)
+        # v1/v2 ডাটাবেজে আর্কাইভ ছিলই না, ওপরের SCHEMA এখনকার documents বানিয়ে দিয়েছে; তাই ধাপগুলো কলাম দেখে
+        cols = [r[1] for r in conn.execute("PRAGMA table_info(documents)")]
+        if 0 < ver < 5 and 'content_key' in cols:
+            migrate_document_tokens(conn)
+        if 0 < ver < 6 and 'status' not in cols:
+            # v5 -> v6: আগের সব ডকুমেন্ট ইস্যুর সময়েই যোগফলে ঢুকেছিল, তাই ওগুলো ফাইনাল
+            conn.execute("ALTER TABLE documents ADD COLUMN status TEXT NOT NULL DEFAULT 'open'")
+            conn.execute("UPDATE documents SET status = 'final'")
+        if 0 < ver < 3:
+            rebuild_sales(conn) # কলাম মাইগ্রেশনের পরে, কারণ documents এর এখনকার রূপ লাগে
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_customers_mkey ON customers(m_key)")
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_products_key ON products(name_key)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_mkey ON documents(m_key)")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+    except:
+        conn.execute("ROLLBACK"); raise
+    # import এর সময় চলে (preload_app এ gunicorn মাস্টারে), তাই খোলা WAL কানেকশন নিয়ে fork না হয়
+    close_db()
+
+def count_customers(): return db().execute("SELECT COUNT(*) FROM customers").fetchone()[0]
+
+def upsert_customer(conn, n, m):
+    # একই মোবাইল আগে থাকলে নাম/নম্বর আপডেট; ফেরত: 'inserted' / 'updated' / 'unchanged'
+    key = mobile_key(m)
+    row = conn.execute("SELECT id, n, m FROM customers WHERE m_key = ?", (key,)).fetchone() if key else None
+    if row is None:
+        conn.execute("INSERT INTO customers (n, m, m_key) VALUES (?, ?, ?)", (n, m, key)); return 'inserted'
+    if (row[1], row[2]) == (n, m): return 'unchanged'
+    conn.execute("UPDATE customers SET n = ?, m = ? WHERE id = ?", (n, m, row[0])); return 'updated'
+
+def upsert_product(conn, name):
+    key = product_key(name)
+    row = conn.execute("SELECT id, name FROM products WHERE name_key = ?", (key,)).fetchone()
+    if row is None:
+        conn.execute("INSERT INTO products (name, name_key) VALUES (?, ?)", (name, key)); return 'inserted'
+    if row[1] == name: return 'unchanged'
+    conn.execute("UPDATE products SET name = ? WHERE id = ?", (name, row[0])); return 'updated'
+
+def add_customer(n, m):
+    upsert_customer(db(), n, m)
+
+def add_product(p):
+    if product_key(p): upsert_product(db(), p)
+
+# ---- CSV ইমপোর্ট / এক্সপোর্ট (রো ধরে স্ট্রিম, ব্যাচে কমিট) ----
+IMPORT_BATCH = 1000
+IMPORT_MAX_ERRORS = 50 # রিপোর্টে প্রথম এতগুলো বাতিল লাইনের কারণ
+
+def import_csv(lines, parse_row, upsert):
+    # lines: টেক্সট লাইনের ইটারেটর; parse_row(row) -> upsert এর আর্গুমেন্ট, নাহলে ValueError
+    # ফাইল মাঝপথে পড়া না গেলে (UTF-8 না / ভাঙা CSV) যা পড়া হয়েছে তা কমিট করে থামে;
+    # রিপোর্টে 'error' আর 'last_line' (শেষ যে লাইন পর্যন্ত কমিট হয়েছে), ঠিক করা ফাইল ওখান থেকে আবার দেয়া যায়
+    conn = db()
+    report = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'rejected': 0, 'errors': [], 'last_line': 0}
+    reader = csv.DictReader(lines)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        try:
+            if reader.fieldnames: reader.fieldnames = [f.strip().lower() for f in reader.fieldnames]
+            for n, row in enumerate(reader, 1):
+                report['last_line'] = reader.line_num
+                try: args = parse_row(row)
+                except ValueError as e:
+                    report['rejected'] += 1
+                    if len(report['errors']) < IMPORT_MAX_ERRORS: report['errors'].append({'line': reader.line_num, 'error': str(e)})
+                    continue
+                report[upsert(conn, *args)] += 1
+                if n % IMPORT_BATCH == 0:
+                    # ব্যাচ শেষে কমিট, যাতে লক বেশিক্ষণ না থাকে আর মেমোরি না বাড়ে
+                    conn.execute("COMMIT"); conn.execute("BEGIN IMMEDIATE")
+        except UnicodeDecodeError as e:
+            report['error'] = f"file is not UTF-8 text after line {report['last_line']} ({e.reason})"
+        except csv.Error as e:
+            report['error'] = f"malformed CSV after line {report['last_line']} ({e})"
+        conn.execute("COMMIT")
+    except:
+        conn.execute("ROLLBACK"); raise
+    return report
+
+def customer_row(row):
+    n, m = (row.get('name') or row.get('n') or "").strip(), (row.get('mobile') or row.get('m') or "").strip()
+    if not n: raise ValueError("missing name")
+    if not mobile_key(m): raise ValueError(f"invalid mobile {m!r}")
+    return n, m
+
+def product_row(row):
+    name = (row.get('name') or row.get('p') or "").strip()
+    if not product_key(name): raise ValueError("missing name")
+    return (name,)
+
+def export_csv(header, query):
+    # কার্সর থেকে সরাসরি, ৫০০ রো করে পাঠানো
+    buf = io.StringIO(); w = csv.writer(buf)
+    w.writerow(header)
+    cur = db().execute(query)
+    while True:
+        rows = cur.fetchmany(500)
+        if not rows: break
+        w.writerows(rows)
+        yield buf.getvalue(); buf.seek(0); buf.truncate()
+    yield buf.getvalue()
+
+def upload_lines():
+    # multipart ফাইল (ডিস্কে স্পুল হয়) অথবা সরাসরি text/csv বডি, দুটোই লাইন ধরে পড়া হয়
+    stream = request.files['file'].stream if 'file' in request.files else request.stream
+    return io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+def table_version(table):
+    return db().execute("SELECT value FROM meta WHERE key = ?", (table,)).fetchone()[0]
+
+# ---- ক্যাটালগ স্ন্যাপশট (কপি-অন-রাইট, ভার্সন স্ট্যাম্প সহ) ----
+# meta টেবিলের ভার্সন না বদলালে একই immutable স্ন্যাপশট, আর তা থেকে একবার বানানো HTML ফ্র্যাগমেন্ট ও
+# সার্চ ইনডেক্স আবার ব্যবহার হয় - কোনো লিস্ট ঘোরানো লাগে না। লেখার পর নতুন স্ন্যাপশট তৈরি হয়ে
+# রেফারেন্স বদলায়; যে রিডার পুরনোটা হাতে নিয়েছে সে পুরনোটাই পুরোপুরি দেখে।
+CATALOG_PAGE_SIZE = 100
+
+class CatalogSnapshot:
+    def __init__(self, version, rows):
+        self.version, self.rows = version, rows
+        self.derived, self.lock = {}, threading.Lock()
+
+    def derive(self, name, build):
+        # এই ভার্সনের জন্য একবারই তৈরি হয়
+        val = self.derived.get(name)
+        if val is None:
+            with self.lock:
+                val = self.derived.get(name)
+                if val is None: val = self.derived[name] = build(self.rows)
+        return val
+
+    def pages(self):
+        return max(1, -(-len(self.rows) // CATALOG_PAGE_SIZE))
+
+    def page_rows(self, page):
+        start = (page - 1) * CATALOG_PAGE_SIZE
+        return self.rows[start:start + CATALOG_PAGE_SIZE]
+
+class Catalog:
+    def __init__(self, table, query):
+        self.table, self.query = table, query
+        self.lock, self.snap = threading.Lock(), None
+
+    def snapshot(self):
+        ver = table_version(self.table)
+        snap = self.snap
+        if snap is not None and snap.version == ver: return snap
+        with self.lock:
+            if self.snap is None or self.snap.version != ver:
+                self.snap = CatalogSnapshot(ver, tuple(db().execute(self.query)))
+            return self.snap
+
+customer_catalog = Catalog('customers', "SELECT id, n, m FROM customers ORDER BY id")
+product_catalog = Catalog('products', "SELECT name FROM products ORDER BY id")
+
+def clamp_page(snap, page):
+    return min(max(page, 1), snap.pages())
+
+def customer_list_html(page):
+    snap = customer_catalog.snapshot(); page = clamp_page(snap, page)
+    html = snap.derive(('list', page), lambda rows: Markup("").join(
+        Markup("<li class='list-group-item'>{} - {}</li>").format(n, m) for _, n, m in snap.page_rows(page)))
+    return html, page, snap.pages()
+
+def product_list_html(page):
+    snap = product_catalog.snapshot(); page = clamp_page(snap, page)
+    html = snap.derive(('list', page), lambda rows: Markup("").join(
+        Markup("<li class='list-group-item'>{}</li>").format(p) for (p,) in snap.page_rows(page)))
+    return html, page, snap.pages()
+
+def product_options_html():
+    return product_catalog.snapshot().derive('options', lambda rows: Markup("").join(Markup('<option value="{}">').format(p) for (p,) in rows))
+
+# ---- কাস্টমার সার্চ ইনডেক্স (নাম ও মোবাইলের সর্টেড লিস্ট + bisect, স্ন্যাপশট থেকে) ----
+def build_customer_index(rows):
+    # নাম আর মোবাইলের আলাদা সর্টেড লিস্ট, যাতে নামের সার্চ কারো নম্বরের সাথে না মেলে
+    names = sorted((n.casefold(), cid) for cid, n, m in rows)
+    mobiles = sorted((key, cid) for cid, n, m in rows for key in [mobile_key(m)] if key) # অসম্পূর্ণ নম্বর (01xxxxxxxxx) বাদ
+    index = [([k for k, _ in entries], [i for _, i in entries]) for entries in (names, mobiles)]
+    return index, {cid: {"n": n, "m": m} for cid, n, m in rows}
+
+def search_customers(q, limit=10):
+    index, by_id = customer_catalog.snapshot().derive('search', build_customer_index)
+    found = []
+    for (keys, ids), prefix in zip(index, (q.strip().casefold(), mobile_prefix(q))):
+        if not prefix: continue
+        i = bisect.bisect_left(keys, prefix)
+        while i < len(keys) and len(found) < limit and keys[i].startswith(prefix):
+            if ids[i] not in found: found.append(ids[i])
+            i += 1
+    return [by_id[cid] for cid in found]
+
+# ---- হেল্পার ফাংশন ----
+def safe_float(val):
+    if not val: return 0.0
+    try: return float(val)
+    except: return 0.0
+
+def is_amount(val):
+    # JSON এ আসা টাকার অঙ্ক: সংখ্যা, সংখ্যার স্ট্রিং বা খালি / null (= 0)
+    if val is None: return True
+    if isinstance(val, bool): return False
+    if isinstance(val, (int, float)): return True
+    if not isinstance(val, str): return False
+    if not val.strip(): return True
+    try: float(val); return True
+    except ValueError: return False
+
+def safe_int(val):
+    if not val: return 0
+    try: return int(val)
+    except: return 0
+
+# ---- মেট্রিক্স (Prometheus টেক্সট, /metrics) ----
+# প্রতিটি প্রসেস নিজের মেমোরিতে গোনে; METRICS_DIR সেট থাকলে সেকেন্ডে সর্বোচ্চ একবার
+# <pid>.json এ স্ন্যাপশট লেখে, আর /metrics সব ফাইল যোগ করে দেখায় (সব gunicorn ওয়ার্কার + PDF পুল)
+# gunicorn.conf.py এটা ডিফল্টে সেট করে; না থাকলে /metrics শুধু উত্তর দেয়া প্রসেসের নিজের সংখ্যা দেখায়
+METRICS_DIR = os.environ.get('METRICS_DIR')
+DOC_TYPES = ("Invoice", "Quotation")
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+ITEM_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+METRIC_HELP = {
+    'http_request_duration_seconds': ('histogram', "Request latency by endpoint, method and status."),
+    'pdf_phase_seconds': ('summary', "Time spent in each phase of a PDF download."),
+    'pdf_documents_total': ('counter', "PDF documents rendered by doc_type."),
+    'pdf_items': ('histogram', "Item count per rendered PDF."),
+}
+
+class Metrics:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        # fork এর পর চাইল্ড প্যারেন্টের গোনা সংখ্যা নিয়ে শুরু করবে না (নাহলে দুবার যোগ হয়)
+        self.lock = threading.Lock()
+        self.counters, self.hists = {}, {}
+        self.last_flush = 0.0
+
+    def inc(self, name, labels, value=1):
+        key = (name, labels)
+        with self.lock: self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, value, buckets):
+        key = (name, labels)
+        with self.lock:
+            h = self.hists.get(key)
+            if h is None: h = self.hists[key] = [list(buckets), [0] * len(buckets), 0.0, 0]
+            i = bisect.bisect_left(h[0], value)
+            if i < len(buckets): h[1][i] += 1
+            h[2] += value; h[3] += 1
+
+    def phases(self, name):
+        # ল্যাপ টাইমার: lap('x') আগের ল্যাপ থেকে এখন পর্যন্ত সময় 'x' ফেজে যোগ করে
+        last = [time.perf_counter()]
+        def lap(phase):
+            now = time.perf_counter()
+            self.observe(name, (('phase', phase),), now - last[0], ())
+            last[0] = now
+        return lap
+
+    def snapshot(self):
+        with self.lock: return as_snapshot(self.counters, self.hists)
+
+    def maybe_flush(self, force=False):
+        if not METRICS_DIR: return
+        now = time.time()
+        if not force and now - self.last_flush < 1: return
+        self.last_flush = now
+        path = os.path.join(METRICS_DIR, f"{os.getpid()}.json")
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f: json.dump(self.snapshot(), f)
+        os.replace(tmp, path)
+
+def as_snapshot(counters, hists):
+    return {'c': [[n, list(l), v] for (n, l), v in counters.items()],
+            'h': [[n, list(l), b, list(cnt), s, c] for (n, l), (b, cnt, s, c) in hists.items()]}
+
+def merge_snapshots(snaps):
+    counters, hists = {}, {}
+    for snap in snaps:
+        for n, l, v in snap['c']:
+            key = (n, tuple(map(tuple, l))); counters[key] = counters.get(key, 0) + v
+        for n, l, b, cnt, s, c in snap['h']:
+            key = (n, tuple(map(tuple, l)))
+            h = hists.setdefault(key, [b, [0] * len(b), 0.0, 0])
+            h[1] = [x + y for x, y in zip(h[1], cnt)]; h[2] += s; h[3] += c
+    return counters, hists
+
+def read_snapshot(path):
+    try:
+        with open(path) as f: return json.load(f)
+    except (OSError, ValueError): return None
+
+def pid_alive(pid):
+    try: os.kill(pid, 0)
+    except ProcessLookupError: return False
+    except PermissionError: pass
+    return True
+
+def dead_snapshots():
+    return [f for f in os.listdir(METRICS_DIR) if f.endswith('.json') and f[:-5].isdigit() and not pid_alive(int(f[:-5]))]
+
+def retire_dead_snapshots():
+    # max_requests এ বদলানো ওয়ার্কার / বন্ধ হওয়া পুল প্রসেসের <pid>.json, retired.json এ যোগ করে মুছে ফেলা;
+    # ফাইল জমে না, আর যোগফল কমে না (Prometheus কমে যাওয়াকে কাউন্টার রিসেট ধরে)
+    if not dead_snapshots(): return
+    import fcntl
+    with open(os.path.join(METRICS_DIR, '.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX) # একসাথে দুই ওয়ার্কার স্ক্র্যাপ করলে একই ফাইল দুবার যোগ না হয়
+        dead = dead_snapshots()
+        if not dead: return
+        retired = os.path.join(METRICS_DIR, 'retired.json')
+        snaps = [read_snapshot(os.path.join(METRICS_DIR, f)) for f in ['retired.json'] + dead]
+        tmp = retired + '.tmp'
+        with open(tmp, 'w') as f: json.dump(as_snapshot(*merge_snapshots(s for s in snaps if s)), f)
+        os.replace(tmp, retired)
+        for fname in dead: os.remove(os.path.join(METRICS_DIR, fname))
+
+def collect_metrics():
+    # সব প্রসেসের স্ন্যাপশট যোগ করা
+    if not METRICS_DIR: return merge_snapshots([metrics.snapshot()])
+    metrics.maybe_flush(force=True)
+    retire_dead_snapshots()
+    snaps = [read_snapshot(os.path.join(METRICS_DIR, f)) for f in os.listdir(METRICS_DIR) if f.endswith('.json')]
+    return merge_snapshots(s for s in snaps if s)
+
+def label_value(v):
+    # Prometheus টেক্সট ফরম্যাটে লেবেলের মানে \, " আর নিউলাইন এস্কেপ করতে হয়
+    return str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def render_metrics():
+    counters, hists = collect_metrics()
+    fmt = lambda labels: "{" + ",".join(f'{k}="{label_value(v)}"' for k, v in labels) + "}" if labels else ""
+    out = []
+    for name, (kind, text) in METRIC_HELP.items():
+        out += [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+        for (n, labels), v in sorted(counters.items()):
+            if n == name: out.append(f"{name}{fmt(labels)} {v}")
+        for (n, labels), (buckets, cnt, s, c) in sorted(hists.items()):
+            if n != name: continue
+            acc = 0
+            for b, x in zip(buckets, cnt):
+                acc += x; out.append(f"{name}_bucket{fmt(labels + (('le', b),))} {acc}")
+            if buckets: out.append(f"{name}_bucket{fmt(labels + (('le', '+Inf'),))} {c}")
+            out += [f"{name}_sum{fmt(labels)} {s}", f"{name}_count{fmt(labels)} {c}"]
+    return "\n".join(out) + "\n"
+
+metrics = Metrics()
+os.register_at_fork(after_in_child=metrics.reset)
+if METRICS_DIR: os.makedirs(METRICS_DIR, exist_ok=True)
+
+# ---- ১. PDF জেনারেটর (আপনার ফিক্সড ডিজাইন) ----
+# ReportLab শুধু PDF বানাতে লাগে, তাই প্রথম দরকারে import হয় - যে ওয়ার্কার শুধু ড্যাশবোর্ড/লিস্ট দেখায়
+# তাকে এর খরচ দিতে হয় না। gunicorn --preload এ create_app() মাস্টারেই এটা লোড করে রাখে।
+A4 = (210 * (72.0 / 2.54 * 0.1), 297 * (72.0 / 2.54 * 0.1)) # reportlab.lib.pagesizes.A4 (pt)
+
+_reportlab = None
+
+def reportlab():
+    global _reportlab
+    if _reportlab is None:
+        from reportlab import rl_config
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfgen import canvas
+        # PDF স্ট্রিম বাইনারি (ASCII85 ছাড়া) - ফাইল ছোট, এনকোডিং কম
+        rl_config.useA85 = 0
+        _reportlab = (canvas, pdfmetrics)
+    return _reportlab
+
+# লেটারহেড ও সিগনেচার ফুটার স্থির, তাই ডকুমেন্টে একবারই একটা ফর্ম (XObject) হিসেবে আঁকা হয়,
+# তারপর প্রতিটি পেজে শুধু doForm দিয়ে স্ট্যাম্প করা হয়
+def define_page_forms(c):
+    width, height = A4
+
+    c.beginForm("page_frame")
+    # --- হেডার ---
+    c.setFont("Helvetica-Bold", 24)
+    c.drawCentredString(width/2, height - 50, "MEHEDI THAI ALUMINUM & GLASS")
+    c.setFont("Helvetica", 9.5) # ফন্ট সাইজ বাড়ানো হয়েছে
+    c.drawCentredString(width/2, height - 65, "West Side Of The Khartoil Boro Mosjid, Satiash Road, Tongi, Gazipur, 1700.")
+    c.setFont("Helvetica-Oblique", 10.5) # ফন্ট সাইজ বাড়ানো হয়েছে
+    c.drawCentredString(width/2, height - 82, "Modern design, durable materials & fast delivery with 100% guarantee.")
+
+    # --- প্রোপাইটর এবং মোবাইল (পাশাপাশি - ফিক্সড) ---
+    c.setFont("Helvetica-Bold", 11)
+    c.drawString(40, height - 110, "Proprietor: ABDUL HANNAN")
+    
+    c.setFont("Helvetica", 10)
+    # নম্বরগুলো পাশাপাশি
+    c.drawString(40, height - 125, "Mobile: +880 1811-179656,  +880 1601-465130,  +880 1967-113830")
+    
+    # প্রোপাইটরের নিচে দাগ (হেডারের নিচে নয়)
+    c.setLineWidth(0.8)
+    c.line(40, height - 135, 555, height - 135)
+
+    # --- সিগনেচার (দাগ উপরে) ---
+    c.setLineWidth(0.8); c.setFont("Helvetica-Bold", 11)
+    c.line(40, 60, 160, 60); c.drawString(45, 45, "Customer Signature")
+    c.line(435, 60, 555, 60); c.drawRightString(550, 45, "Authorized Signature")
+    c.endForm()
+
+def stamp_page(c):
+    c.doForm("page_frame")
+
+TABLE_X = [40, 310, 370, 420, 480, 555]
+TABLE_HEADERS = ["DESCRIPTION", "SQ.FT", "QTY", "RATE", "TOTAL"]
+PAGE_BOTTOM = 80 # সিগনেচারের উপরে টেবিল এর নিচে নামবে না
+ROW_H = 20       # হেডার / brought-carried forward সারির উচ্চতা
+
+# ---- টেক্সট লেআউট (ফন্টের গ্লিফ-প্রস্থ ক্যাশ + ওয়ার্ড র‍্যাপ) ----
+# কলামের মাপ: টাইটেল x=45 থেকে SQ.FT কলামের আগে, বিবরণ x=70 থেকে ডান ব্র্যাকেটের জায়গা রেখে
+TITLE_FONT, TITLE_SIZE, TITLE_LEADING, TITLE_W = "Helvetica-Bold", 10, 12, TABLE_X[1] - 50
+DESC_FONT, DESC_SIZE, DESC_LEADING, DESC_W = "Helvetica", 10.5, 14, TABLE_X[1] - 85
+NOTE_FONT, NOTE_SIZE, NOTE_LEADING, NOTE_W = "Helvetica", 9, 11, 310
+
+class GlyphWidths(dict):
+    # প্রতিটি ক্যারেক্টারের প্রস্থ (১০০০ ইউনিটে) একবার মেপে রাখা; পরে শুধু dict লুকআপ
+    def __init__(self, font):
+        self.font = font
+
+    def __missing__(self, ch):
+        w = self[ch] = reportlab()[1].stringWidth(ch, self.font, 1000)
+        return w
+
+_glyph_tables = {}
+
+def glyph_widths(font):
+    table = _glyph_tables.get(font)
+    if table is None: table = _glyph_tables[font] = GlyphWidths(font)
+    return table
+
+def wrap_lines(text, font, size, max_w):
+    # '\n' এ প্যারাগ্রাফ, তারপর শব্দ ধরে greedy র‍্যাপ; কলামের চেয়ে লম্বা শব্দ অক্ষর ধরে ভাঙে।
+    # একটা একটা স্পেসে ভাঙা হয় (খালি টোকেন থাকে), তাই শুরুর ইনডেন্ট, পরপর কয়েকটা স্পেস আর ট্যাব
+    # যেমন লেখা তেমনই আঁকা হয়; শুধু র‍্যাপের জায়গার স্পেসগুলো বাদ পড়ে।
+    # ফেরত: (লাইনগুলো, প্রতিটি লাইনের প্রস্থ pt এ)
+    g = glyph_widths(font)
+    limit, space = max_w * 1000 / size, g[' ']
+    lines, widths = [], []
+    def emit(words, w):
+        while len(words) > 1 and not words[-1]: words.pop(); w -= space
+        lines.append(" ".join(words)); widths.append(w * size / 1000)
+    for para in text.split('\n'):
+        words, lw, broke = [], 0.0, False
+        for word in para.split(' '):
+            ww = sum(map(g.__getitem__, word))
+            if words and lw + space + ww <= limit:
+                words.append(word); lw += space + ww
+                continue
+            if any(words): emit(words, lw); broke = True
+            words, lw = [], 0.0
+            if not word and broke: continue
+            if ww > limit:
+                piece, pw = [], 0.0
+                for ch in word:
+                    cw = g[ch]
+                    if piece and pw + cw > limit:
+                        emit(["".join(piece)], pw); piece, pw, broke = [], 0.0, True
+                    piece.append(ch); pw += cw
+                word, ww = "".join(piece), pw
+            words, lw = [word], ww
+        emit(words, lw)
+    return tuple(lines), tuple(widths)
+
+# একই বিবরণ / নোট বারবার আসে, তাই র‍্যাপের ফলাফলও ক্যাশ
+wrap_text = lru_cache(maxsize=4096)(wrap_lines)
+
+class ItemLayout:
+    # আঁকার আগেই আইটেমের টাইটেল ও বিবরণের লাইন আর উচ্চতা - পেজ ব্রেক ও ব্র্যাকেট দুটোই এটা দেখে
+    __slots__ = ('title', 'desc', 'desc_w', 'head')
+
+    def __init__(self, sl, item):
+        self.title = wrap_text(f"{sl}. {item['title']}", TITLE_FONT, TITLE_SIZE, TITLE_W)[0]
+        desc = item.get('desc')
+        self.desc, self.desc_w = wrap_text(desc, DESC_FONT, DESC_SIZE, DESC_W) if desc and desc.strip() else ((), ())
+        # টাইটেল সারির উচ্চতা (টাইটেল বেশি লাইনের হলে বাড়ে)
+        self.head = 20 + TITLE_LEADING * (len(self.title) - 1)
+
+    def segment_height(self, first, n):
+        # first: টাইটেল সহ প্রথম অংশ; n: এই অংশে বিবরণের কয়টা লাইন
+        if first: return self.head + (25 + DESC_LEADING * n if self.desc else 10)
+        return 20 + DESC_LEADING * n
+
+    def lines_fitting(self, first, room):
+        return int((room - self.segment_height(first, 0)) // DESC_LEADING)
+
+    @property
+    def height(self):
+        return self.segment_height(True, len(self.desc))
+
+    @property
+    def min_height(self):
+        return self.segment_height(True, min(1, len(self.desc)))
+
+def summary_height(doc_type, note_lines):
+    return 30 + (50 if doc_type == "Invoice" else 0) + (10 + NOTE_LEADING * (len(note_lines) - 1) if note_lines else 0)
+
+def draw_desc(c, top, lines, widths, arrow):
+    # বিবরণের লাইন + দুই পাশে চিকন ব্র্যাকেট; top থেকে আঁকা শুরু, নিচের y ফেরত
+    if arrow:
+        # --- তীর চিহ্ন (Arrow) ---
+        arrow_x = 60
+        c.setLineWidth(0.8)
+        c.line(arrow_x, top, arrow_x, top - 10) # সোজা দাগ
+        # তীরের মাথা
+        c.line(arrow_x, top - 10, arrow_x - 3, top - 7)
+        c.line(arrow_x, top - 10, arrow_x + 3, top - 7)
+        list_y = top - 20
+    else:
+        list_y = top - 15
+
+    c.setFont(DESC_FONT, DESC_SIZE) # বড় ফন্ট
+    start_l_y = list_y + 10
+    for line in lines:
+        c.drawString(70, list_y, line)
+        list_y -= DESC_LEADING
+
+    # --- অতি চিকন ব্র্যাকেট (0.3) ---
+    c.setLineWidth(0.3)
+    c.setStrokeColorRGB(0.3, 0.3, 0.3)
+
+    # বাম ব্র্যাকেট [
+    c.line(60, start_l_y, 55, start_l_y)
+    c.line(55, start_l_y, 55, list_y+5)
+    c.line(55, list_y+5, 60, list_y+5)
+
+    # ডান ব্র্যাকেট ]
+    rx = 70 + max(widths) + 10
+    c.line(rx-5, start_l_y, rx, start_l_y)
+    c.line(rx, start_l_y, rx, list_y+5)
+    c.line(rx, list_y+5, rx-5, list_y+5)
+
+    c.setStrokeColorRGB(0,0,0)
+    return list_y - 5
+
+def draw_item(c, y, item, lay, n):
+    # টাইটেল সারি + বিবরণের প্রথম n লাইন
+    x_coords = TABLE_X
+    t_val = safe_float(item['total'])
+    text_y = y - 15
+    
+    # SL নং টাইটেলের আগে (1. Window)
+    c.setFont(TITLE_FONT, TITLE_SIZE)
+    for j, line in enumerate(lay.title):
+        c.drawString(45, text_y - TITLE_LEADING * j, line)
+    
+    # মাপ ও হিসাব (Centered)
+    c.setFont("Helvetica", 10)
+    c.drawCentredString((x_coords[1]+x_coords[2])/2, text_y, str(item['feet']) if safe_float(item['feet']) > 0 else "-")
+    c.drawCentredString((x_coords[2]+x_coords[3])/2, text_y, str(item['pcs']) if safe_int(item['pcs']) > 0 else "-")
+    c.drawCentredString((x_coords[3]+x_coords[4])/2, text_y, str(item['rate']) if safe_float(item['rate']) > 0 else "-")
+    c.drawRightString(550, text_y, f"{t_val:.0f}")
+    
+    curr_y = y - lay.head
+    
+    # বিবরণ থাকলে তীর ও ব্র্যাকেট
+    if lay.desc: return draw_desc(c, curr_y, lay.desc[:n], lay.desc_w[:n], True)
+    return curr_y - 10
+
+def draw_forward_row(c, y, label, amount):
+    # আগের / পরের পেজের সাবটোটাল
+    c.setLineWidth(1)
+    c.line(40, y, 555, y)
+    c.setFont("Helvetica-BoldOblique", 10)
+    c.drawString(45, y - 14, label)
+    c.drawRightString(550, y - 14, f"{amount:,.0f}")
+    return y - ROW_H
+
+def generate_pdf(items_list, doc_type, c_name, c_mob, advance, note, doc_date=None, doc_no=None):
+    # আইটেম যত বেশিই হোক, পেজ ভরে গেলে আইটেমের সীমানায় নতুন পেজ শুরু হয়;
+    # এক পেজে না ধরা লম্বা বিবরণ লাইনের সীমানায় ভেঙে পরের পেজে চলে যায়।
+    # প্রতিটি পেজে টেবিল হেডার আবার আসে, সাবটোটাল পরের পেজে যায়, হিসাব বক্স শেষ পেজে।
+    # showPage এর পর আগের পেজের ড্রয়িং স্টেট ধরে রাখা হয় না।
+    # লেটেন্সি বাজেট: ১,০০০ আইটেম (~১০০ পেজ) ৫০০ ms এর মধ্যে।
+    lap = metrics.phases('pdf_phase_seconds')
+    buffer = io.BytesIO()
+    c = reportlab()[0].Canvas(buffer, pagesize=A4)
+    width, height = A4
+    define_page_forms(c)
+    curr_date = doc_date or datetime.now().strftime("%d/%m/%Y")
+    page_no = 0
+
+    def begin_page():
+        nonlocal page_no
+        page_no += 1
+        stamp_page(c)
+
+        # --- তারিখ ও নং ---
+        c.setFont("Helvetica-Bold", 10)
+        c.drawRightString(555, height - 110, f"Date: {curr_date}")
+        if doc_no: c.drawRightString(555, height - 125, f"{doc_type} No: #{doc_no}")
+
+        # --- কাস্টমার তথ্য (প্রথম পেজে) ---
+        if page_no == 1:
+            c.setFont("Helvetica-Bold", 10)
+            c.drawString(40, height - 155, f"Customer Name: {c_name}")
+            c.drawString(40, height - 170, f"Mobile: {c_mob}")
+            return height - 190
+        return height - 155
+
+    def begin_table(y):
+        # --- টেবিল হেডার ---
+        c.setFont("Helvetica-Bold", 9)
+        for i, h in enumerate(TABLE_HEADERS):
+            c.drawCentredString((TABLE_X[i]+TABLE_X[i+1])/2, y - 14, h)
+        c.setLineWidth(1)
+        c.line(40, y - ROW_H, 555, y - ROW_H) # হেডারের নিচের দাগ
+        return y - ROW_H
+
+    def close_table(top, y):
+        # --- টেবিলের সলিড দাগ ---
+        c.setLineWidth(1)
+        for x in TABLE_X: c.line(x, top, x, y)
+        c.line(40, top, 555, top)
+        c.line(40, y, 555, y)
+
+    def end_page():
+        c.setFont("Helvetica", 9)
+        c.drawCentredString(width/2, 45, f"Page {page_no}")
+        c.showPage()
+
+    table_top = begin_page()
+    curr_y = begin_table(table_top)
+    grand_total = 0
+    lap('header')
+
+    def next_page():
+        nonlocal table_top, curr_y
+        curr_y = draw_forward_row(c, curr_y, "Carried forward", grand_total)
+        close_table(table_top, curr_y)
+        end_page()
+        table_top = begin_page()
+        curr_y = begin_table(table_top)
+        curr_y = draw_forward_row(c, curr_y, "Brought forward", grand_total)
+
+    layouts = [ItemLayout(i + 1, item) for i, item in enumerate(items_list)]
+    note_lines = wrap_text(note, NOTE_FONT, NOTE_SIZE, NOTE_W)[0] if note else ()
+    lap('layout')
+    
+    # --- আইটেম লুপ ---
+    last = len(items_list) - 1
+    on_page = 0
+    # নতুন (দ্বিতীয় বা পরের) পেজে হেডার + brought-forward সারির পর আইটেমের জন্য পুরো জায়গা
+    page_room = height - 155 - 2 * ROW_H - PAGE_BOTTOM
+    for i, item in enumerate(items_list):
+        lay = layouts[i]
+        # শেষ আইটেম না হলে নিচে carried-forward সারির জায়গা রাখতে হবে
+        reserve = 0 if i == last else ROW_H
+        room = curr_y - PAGE_BOTTOM
+        if on_page and lay.height + reserve > room:
+            # খালি পেজে পুরোটা ধরলে পুরো আইটেমই পরের পেজে; পেজের চেয়েও লম্বা হলে এখান থেকেই লাইন ধরে ভাঙে
+            # (তবে টাইটেল + বিবরণের একটা লাইনও না ধরলে পরের পেজ থেকে)
+            if lay.height + reserve <= page_room or lay.min_height + ROW_H > room:
+                next_page(); on_page = 0
+        grand_total += safe_float(item['total'])
+        rest, first = 0, True
+        while True:
+            room, left = curr_y - PAGE_BOTTOM, len(lay.desc) - rest
+            n = left if lay.segment_height(first, left) + reserve <= room else max(1, lay.lines_fitting(first, room - ROW_H))
+            if first:
+                curr_y = draw_item(c, curr_y, item, lay, n)
+            else:
+                curr_y = draw_desc(c, curr_y, lay.desc[rest:rest + n], lay.desc_w[rest:rest + n], False)
+            on_page += 1
+            rest += n
+            if rest >= len(lay.desc): break
+            next_page(); first = False
+    lap('items')
+
+    close_table(table_top, curr_y)
+    lap('table_lines')
+
+    # --- হিসাব বক্স শেষ পেজে; জায়গা না থাকলে নতুন পেজে ---
+    # নতুন পেজেও না ধরা লম্বা নোট বিবরণের মতো লাইন ধরে ভাঙে, তাই তখন নোটের প্রথম লাইনের জায়গা হলেই এখান থেকে শুরু
+    if curr_y - summary_height(doc_type, note_lines) < PAGE_BOTTOM:
+        if (summary_height(doc_type, note_lines) <= height - 155 - PAGE_BOTTOM
+                or curr_y - summary_height(doc_type, note_lines[:1]) < PAGE_BOTTOM):
+            end_page()
+            curr_y = begin_page()
+
+    summary_y = curr_y - 30
+    c.setLineWidth(1.2)
+    c.rect(400, summary_y, 155, 25); c.setFont("Helvetica-Bold", 11)
+    c.drawString(405, summary_y+7, "Grand Total:"); c.drawRightString(550, summary_y+7, f"{grand_total:,.0f} Tk")
+    
+    if doc_type == "Invoice":
+        summary_y -= 25; c.rect(400, summary_y, 155, 25)
+        c.drawString(405, summary_y+7, "Advance:"); c.drawRightString(550, summary_y+7, f"{advance:,.0f} Tk")
+        summary_y -= 25; c.rect(400, summary_y, 155, 25)
+        c.drawString(405, summary_y+7, "Due:"); c.drawRightString(550, summary_y+7, f"{grand_total-advance:,.0f} Tk")
+
+    # --- নোট বক্স (লাইন বেশি হলে নিচের দিকে বড় হয়; পেজে না ধরলে বাকি লাইন পরের পেজে) ---
+    rest, label = 0, "Note:"
+    while rest < len(note_lines):
+        n = min(len(note_lines) - rest, max(1, 1 + int((summary_y - 10 - PAGE_BOTTOM) // NOTE_LEADING)))
+        extra = NOTE_LEADING * (n - 1)
+        c.setLineWidth(0.8)
+        c.rect(40, summary_y-10-extra, 320, 40+extra)
+        c.setFont("Helvetica-Bold", 10); c.drawString(45, summary_y+15, label)
+        c.setFont(NOTE_FONT, NOTE_SIZE)
+        for j, line in enumerate(note_lines[rest:rest + n]):
+            c.drawString(45, summary_y+2 - NOTE_LEADING * j, line)
+        rest += n
+        if rest < len(note_lines):
+            end_page()
+            summary_y, label = begin_page() - 30, "Note (continued):"
+
+    if page_no > 1:
+        c.setFont("Helvetica", 9)
+        c.drawCentredString(width/2, 45, f"Page {page_no}")
+    lap('summary')
+    c.save(); buffer.seek(0)
+    lap('save')
+    # URL থেকে আসা doc_type সরাসরি লেবেল হলে সিরিজের সংখ্যা সীমাহীন হয়ে যায়
+    metrics.inc('pdf_documents_total', (('doc_type', doc_type if doc_type in DOC_TYPES else 'other'),))
+    metrics.observe('pdf_items', (), len(items_list), ITEM_BUCKETS)
+    return buffer
+
+def warm_pdf():
+    # fork এর আগে একবার: ReportLab import, সাধারণ অক্ষরের গ্লিফ-প্রস্থ, আর একটা ছোট PDF বানিয়ে
+    # ReportLab এর ফন্ট/এনকোডিং ক্যাশ ভরা - এরপর প্রতিটি ওয়ার্কার এগুলো copy-on-write শেয়ার করে
+    reportlab()
+    for font in {TITLE_FONT, DESC_FONT, NOTE_FONT}:
+        table = glyph_widths(font)
+        for ch in map(chr, range(32, 127)): table[ch]
+    generate_pdf([{'title': "warmup", 'desc': "warmup", 'feet': 1, 'pcs': 1, 'rate': 1, 'total': 1}], "Invoice", "", "", 0, "warmup", "01/01/2000", 1)
+
+# ---- বাল্ক ডকুমেন্ট (প্রসেস পুল + ZIP স্ট্রিম) ----
+BULK_MAX_DOCS = 500
+# প্রতিটি gunicorn ওয়ার্কারের নিজের পুল, তাই ডিফল্টে CPU গুলো ওয়ার্কারদের মধ্যে ভাগ হয় (gunicorn.conf.py দেখুন)
+PDF_POOL_WORKERS = int(os.environ.get('PDF_POOL_WORKERS', max(1, (os.cpu_count() or 1) // int(os.environ.get('WEB_CONCURRENCY', 1)))))
+ITEM_KEYS = ('title', 'feet', 'pcs', 'rate', 'total')
+
+def items_error(items):
+    # রেন্ডারে যা লাগে তা না থাকলে নম্বর নেয়ার আগেই ধরা পড়ে; ঠিক থাকলে None
+    if not isinstance(items, list): return "items must be a list"
+    for n, it in enumerate(items, 1):
+        if not isinstance(it, dict) or not all(k in it for k in ITEM_KEYS):
+            return f"item {n}: expected an object with {', '.join(ITEM_KEYS)}"
+        if not isinstance(it['title'], str) or not isinstance(it.get('desc') or '', str):
+            return f"item {n}: title must be a string and desc a string or null"
+    return None
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+def pdf_pool():
+    # প্রতিটি gunicorn ওয়ার্কারে প্রথম দরকারে একবার তৈরি হয়
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            _pdf_pool = ProcessPoolExecutor(max_workers=PDF_POOL_WORKERS)
+        return _pdf_pool
+
+def submit_render(doc):
+    # পুলের কোনো প্রসেস মারা গেলে (যেমন OOM kill) পুরো পুল broken হয়ে যায় আর প্রতিটি submit ব্যর্থ হয়;
+    # তখন পুলটা ফেলে নতুন বানিয়ে একবার আবার চেষ্টা, ওয়ার্কার রিসাইকেল হওয়া পর্যন্ত অপেক্ষা না করে
+    global _pdf_pool
+    from concurrent.futures.process import BrokenProcessPool
+    pool = pdf_pool()
+    try: return pool.submit(render_document, doc)
+    except BrokenProcessPool:
+        with _pdf_pool_lock:
+            if _pdf_pool is pool: _pdf_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+        return pdf_pool().submit(render_document, doc)
+
+def render_document(doc):
+    # পুলের প্রসেসে চলে; শুধু PDF বাইট ফেরত দেয়
+    pdf = generate_pdf(doc['items'], doc['doc_type'], doc['c_name'], doc['c_mob'], safe_float(doc.get('adv')), doc.get('note', ''), doc.get('doc_date'), doc.get('doc_no'))
+    metrics.maybe_flush(force=True)
+    return pdf.getvalue()
+
+def document_filename(seq, doc):
+    name = "".join(ch if ch.isalnum() else "_" for ch in f"{doc['doc_type']}_{doc['c_name']}")
+    return f"{seq:03d}_{name}.pdf"
+
+class ZipStream(io.RawIOBase):
+    # ZipFile এখানে লেখে, আর জেনারেটর প্রতিটি ফাইলের পর লেখা বাইটগুলো তুলে নেয়
+    def __init__(self): self.chunks = []
+    def writable(self): return True
+    def write(self, b):
+        self.chunks.append(bytes(b)); return len(b)
+    def drain(self):
+        out = b"".join(self.chunks); self.chunks.clear(); return out
+
+BULK_IN_FLIGHT = 2 * PDF_POOL_WORKERS # একসাথে এর বেশি রেন্ডার পুলে থাকে না, তাই মেমোরিতে সর্বোচ্চ এতগুলো PDF
+
+def stream_bulk_zip(docs):
+    pending, futures, failed = iter(enumerate(docs, 1)), {}, []
+    def submit_next():
+        # নম্বর আগেই নেয়া, তাই পুলে পাঠানো না গেলেও ডকুমেন্টটা ZIP এ error এন্ট্রি হয়ে আসে
+        for seq, doc in pending:
+            try: futures[submit_render(doc)] = seq
+            except Exception as e: failed.append((seq, e))
+            return
+    out = ZipStream()
+    try:
+        for _ in range(BULK_IN_FLIGHT): submit_next()
+        with zipfile.ZipFile(out, 'w', zipfile.ZIP_STORED) as zf:
+            # যেটা আগে শেষ হয় সেটাই আগে পাঠানো হয়; লেখা হলেই ফিউচার (আর তার PDF) ছেড়ে দিয়ে পরেরটা পুলে
+            while futures or failed:
+                while failed:
+                    seq, e = failed.pop(0)
+                    zf.writestr(f"{seq:03d}_error.txt", f"Error: {e}")
+                    submit_next()
+                    yield out.drain()
+                if not futures: break
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                while done:
+                    fut = done.pop()
+                    seq = futures.pop(fut)
+                    doc = docs[seq-1]
+                    try:
+                        zf.writestr(document_filename(seq, doc), fut.result())
+                        if doc.get('finalize'): finalize_document(doc['doc_type'], doc['doc_no'])
+                    except Exception as e: zf.writestr(f"{seq:03d}_error.txt", f"Error: {e}")
+                    fut = None
+                    submit_next()
+                    yield out.drain()
+        yield out.drain()
+    finally:
+        # ক্লায়েন্ট মাঝপথে চলে গেলে বাকি কাজ বাতিল
+        for fut in futures: fut.cancel()
+
+# ---- অ্যাসিঙ্ক রেন্ডার জব (প্রসেস পুলে চলে, স্ট্যাটাস SQLite এ - যেকোনো ওয়ার্কার থেকে দেখা যায়) ----
+JOB_QUEUE_MAX = int(os.environ.get('JOB_QUEUE_MAX', 32)) # সব ওয়ার্কার মিলিয়ে সর্বোচ্চ পেন্ডিং জব
+JOB_TTL = 3600 # এর বেশি পুরনো জব (এবং তার PDF) মুছে যায়
+
+def pending_jobs():
+    return db().execute("SELECT COUNT(*) FROM jobs WHERE status = 'pending'").fetchone()[0]
+
+def enqueue_job(doc, finalize=False):
+    # কিউ ভরা থাকলে None; নাহলে জব আইডি
+    conn = db()
+    job_id = uuid.uuid4().hex
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        now = time.time()
+        conn.execute("DELETE FROM jobs WHERE created < ?", (now - JOB_TTL,))
+        if pending_jobs() >= JOB_QUEUE_MAX:
+            conn.execute("COMMIT"); return None
+        conn.execute("INSERT INTO jobs (id, status, doc_type, created) VALUES (?, 'pending', ?, ?)", (job_id, doc['doc_type'], now))
+        conn.execute("COMMIT")
+    except:
+        conn.execute("ROLLBACK"); raise
+    try: fut = submit_render(doc)
+    except Exception as e:
+        # পুলে পাঠানোই না গেলে জব pending থেকে কিউয়ের জায়গা আটকে রাখবে না
+        db().execute("UPDATE jobs SET status = 'error', error = ? WHERE id = ?", (str(e), job_id))
+        return job_id
+    fut.add_done_callback(lambda f: finish_job(job_id, f, doc if finalize else None))
+    return job_id
+
+def finish_job(job_id, fut, finalize_doc=None):
+    # রেন্ডার সফল হলে তবেই ফাইনাল (চাওয়া থাকলে)
+    try:
+        db().execute("UPDATE jobs SET status = 'done', pdf = ? WHERE id = ?", (fut.result(), job_id))
+        if finalize_doc: finalize_document(finalize_doc['doc_type'], finalize_doc['doc_no'])
+    except Exception as e: db().execute("UPDATE jobs SET status = 'error', error = ? WHERE id = ?", (str(e), job_id))
+
+def get_job(job_id):
+    row = db().execute("SELECT id, status, doc_type, error FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return dict(zip(("id", "status", "doc_type", "error"), row)) if row else None
+
+def job_pdf(job_id):
+    row = db().execute("SELECT pdf FROM jobs WHERE id = ? AND status = 'done'", (job_id,)).fetchone()
+    return row[0] if row else None
+
+# ---- PDF আউটপুট ক্যাশ (কনটেন্ট হ্যাশ কী, মেমোরি LRU + ঐচ্ছিক ডিস্ক) ----
+PDF_CACHE_MAX_BYTES = int(os.environ.get('PDF_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+PDF_CACHE_DIR = os.environ.get('PDF_CACHE_DIR') # সেট করলে ডিস্কেও রাখা হয়
+PDF_CACHE_DISK_MAX_BYTES = int(os.environ.get('PDF_CACHE_DISK_MAX_BYTES', 512 * 1024 * 1024))
+PDF_CACHE_PRUNE_EVERY = 50 # এতগুলো ডিস্কে লেখার পর একবার সাইজ দেখা হয়
+# generate_pdf এর লেআউট / ফন্ট / হেডার বদলালে এটা বাড়াতে হবে, নাহলে পুরনো PDF ক্যাশ থেকে আসবে
+PDF_RENDER_VERSION = 3
+
+def pdf_cache_key(doc):
+    # একই ইনপুট = একই PDF, তাই ইনপুটের ক্যানোনিকাল JSON এর হ্যাশই কী (এবং ETag); নম্বরও PDF এ ছাপা হয়, তাই কী এর অংশ
+    raw = json.dumps([PDF_RENDER_VERSION, doc['items'], doc['doc_type'], doc['c_name'], doc['c_mob'], doc['adv'], doc['note'], doc['doc_date'], doc.get('doc_no')],
+                     sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+class PdfCache:
+    def __init__(self, max_bytes, disk_dir=None):
+        self.max_bytes, self.disk_dir = max_bytes, disk_dir
+        self.entries, self.size = OrderedDict(), 0
+        self.lock = threading.Lock()
+        self.disk_writes = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self.prune_disk()
+
+    def get(self, key):
+        with self.lock:
+            data = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key); return data
+        if self.disk_dir:
+            path = os.path.join(self.disk_dir, key + '.pdf')
+            try:
+                with open(path, 'rb') as f: data = f.read()
+                os.utime(path) # mtime = শেষ ব্যবহার, prune_disk পুরনোগুলো আগে ফেলে
+            except OSError: return None
+            self._remember(key, data)
+        return data
+
+    def put(self, key, data):
+        self._remember(key, data)
+        if self.disk_dir:
+            # tmp ফাইলে লিখে rename, যাতে অন্য ওয়ার্কার অর্ধেক ফাইল না পড়ে
+            path = os.path.join(self.disk_dir, key + '.pdf')
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f: f.write(data)
+            os.replace(tmp, path)
+            self.disk_writes += 1
+            if self.disk_writes % PDF_CACHE_PRUNE_EVERY == 0: self.prune_disk()
+
+    def prune_disk(self, max_bytes=None):
+        # ডিস্ক ফোল্ডার সীমার বেশি হলে সবচেয়ে কম সময় আগে ব্যবহার হওয়াগুলো মুছে ফেলা; অন্য ওয়ার্কার একসাথে মুছলেও সমস্যা নেই
+        max_bytes = PDF_CACHE_DISK_MAX_BYTES if max_bytes is None else max_bytes
+        files = []
+        with os.scandir(self.disk_dir) as it:
+            for ent in it:
+                if not ent.name.endswith('.pdf'): continue
+                try: st = ent.stat()
+                except OSError: continue
+                files.append((st.st_mtime, st.st_size, ent.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= max_bytes: break
+            try: os.remove(path)
+            except OSError: pass
+            total -= size
+
+    def _remember(self, key, data):
+        if len(data) > self.max_bytes: return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None: self.size -= len(old)
+            self.entries[key] = data; self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False); self.size -= len(evicted)
+
+pdf_cache = PdfCache(PDF_CACHE_MAX_BYTES, PDF_CACHE_DIR)
+
+# ---- ডকুমেন্ট নম্বর ও আর্কাইভ ----
+# নম্বর আর আর্কাইভ রেকর্ড একই ট্রানজ্যাকশনে লেখা হয় (BEGIN IMMEDIATE = সব ওয়ার্কারের মধ্যে লক),
+# তাই নম্বর কখনো ডুপ্লিকেট হয় না। আর্কাইভে PDF না, শুধু ইনপুট (items zlib-কম্প্রেসড JSON) থাকে।
+# নম্বর বাঁধা থাকে ইস্যু token এ: ফর্ম খোলার সময় (বা খসড়া তৈরির সময়) একবার বানানো হয়, ডাউনলোডের সাথে আসে।
+# একই token আবার এলে (আবার ডাউনলোড, বা নোট/আইটেম ঠিক করে) একই নম্বর, আর্কাইভে নতুন কনটেন্ট;
+# নতুন token মানে নতুন বিক্রি, কনটেন্ট হুবহু এক হলেও।
+# নম্বর নেয়া ডকুমেন্ট 'open'; বিক্রির যোগফলে ঢোকে শুধু finalize_document এ ('final' - PDF ঠিকমতো রেন্ডার হওয়ার পর,
+# চাইলে তবেই), void_document তার যোগফল বাদ দেয় ('void', নম্বর আর্কাইভে থেকে যায়)।
+DOC_NO_START = 200
+DOC_COLS = "doc_date, c_name, c_mob, advance, grand_total, items"
+
+def iso_date(doc_date):
+    return datetime.strptime(doc_date, "%d/%m/%Y").date().isoformat()
+
+def new_issue_token():
+    return uuid.uuid4().hex
+
+def issue_document(token, doc):
+    conn = db()
+    items = zlib.compress(json.dumps(doc['items'], separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+    grand_total = sum(safe_float(it.get('total')) for it in doc['items'])
+    day = iso_date(doc['doc_date'])
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(f"SELECT doc_type, doc_no, status, {DOC_COLS} FROM documents WHERE token = ?", (token,)).fetchone()
+        if row and row[0] != doc['doc_type']: raise ValueError("issue token belongs to another document type")
+        if row and row[2] == 'void': raise ValueError(f"{doc['doc_type']} #{row[1]} was voided, start a new one")
+        if row is None:
+            doc_no = conn.execute("INSERT INTO doc_counters (doc_type, last) VALUES (?, ?) ON CONFLICT(doc_type) DO UPDATE SET last = last + 1 RETURNING last",
+                                  (doc['doc_type'], DOC_NO_START)).fetchone()[0]
+            conn.execute("INSERT INTO documents (doc_type, doc_no, token, c_name, c_mob, m_key, doc_date, advance, note, grand_total, items) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         (doc['doc_type'], doc_no, token, doc['c_name'], doc['c_mob'], mobile_key(doc['c_mob']), day, doc['adv'], doc['note'], grand_total, items))
+        else:
+            doc_no = row[1]
+            conn.execute("UPDATE documents SET c_name = ?, c_mob = ?, m_key = ?, doc_date = ?, advance = ?, note = ?, grand_total = ?, items = ? WHERE token = ?",
+                         (doc['c_name'], doc['c_mob'], mobile_key(doc['c_mob']), day, doc['adv'], doc['note'], grand_total, items, token))
+            if row[2] == 'final':
+                # ফাইনাল ডকুমেন্টের সংশোধন: আগের কনটেন্টের যোগফল বাদ দিয়ে নতুনটা
+                deltas = document_sales(doc['doc_type'], row[3:], sign=-1)
+                write_sales(conn, sales_deltas(doc['doc_type'], day, doc['c_name'], doc['c_mob'], doc['adv'], grand_total, doc['items'], deltas))
+        conn.execute("COMMIT")
+    except:
+        conn.execute("ROLLBACK"); raise
+    return doc_no
+
+def set_document_status(doc_type, doc_no, status):
+    # open -> final: যোগফলে যোগ; final -> void: বাদ; open -> void: শুধু স্ট্যাটাস; void এর পর আর কিছু বদলায় না।
+    # ফেরত: এখনকার স্ট্যাটাস (ডকুমেন্ট না থাকলে None)
+    conn = db()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(f"SELECT status, {DOC_COLS} FROM documents WHERE doc_type = ? AND doc_no = ?", (doc_type, doc_no)).fetchone()
+        if row is None:
+            conn.execute("ROLLBACK"); return None
+        if row[0] in (status, 'void'):
+            conn.execute("COMMIT"); return row[0]
+        if status == 'final': write_sales(conn, document_sales(doc_type, row[1:]))
+        elif row[0] == 'final': write_sales(conn, document_sales(doc_type, row[1:], sign=-1))
+        conn.execute("UPDATE documents SET status = ? WHERE doc_type = ? AND doc_no = ?", (status, doc_type, doc_no))
+        conn.execute("COMMIT")
+    except:
+        conn.execute("ROLLBACK"); raise
+    return status
+
+def finalize_document(doc_type, doc_no):
+    return set_document_status(doc_type, doc_no, 'final')
+
+def void_document(doc_type, doc_no):
+    return set_document_status(doc_type, doc_no, 'void')
+
+DOC_SUMMARY_COLS = "doc_type, doc_no, c_name, c_mob, doc_date, advance, grand_total, status"
+
+def load_document(doc_type, doc_no):
+    row = db().execute("SELECT c_name, c_mob, doc_date, advance, note, items FROM documents WHERE doc_type = ? AND doc_no = ?", (doc_type, doc_no)).fetchone()
+    if not row: return None
+    c_name, c_mob, d, adv, note, items = row
+    doc = {'items': json.loads(zlib.decompress(items)), 'doc_type': doc_type, 'doc_no': doc_no, 'c_name': c_name, 'c_mob': c_mob,
+           'adv': adv, 'note': note, 'doc_date': datetime.strptime(d, "%Y-%m-%d").strftime("%d/%m/%Y")}
+    return pdf_cache_key(doc), doc
+
+def find_documents(mobile=None, date=None, doc_type=None, limit=50):
+    # মোবাইল / তারিখ ইনডেক্স দিয়ে খোঁজা, নতুনগুলো আগে; মোবাইল যেকোনো রূপে লেখা হোক (+880 / 880 / 0), একই কী
+    where, args = [], []
+    if mobile:
+        key = mobile_key(mobile)
+        if key: where.append("m_key = ?"); args.append(key)
+        else: where.append("c_mob = ?"); args.append(mobile)
+    if date: where.append("doc_date = ?"); args.append(date)
+    if doc_type: where.append("doc_type = ?"); args.append(doc_type)
+    sql = f"SELECT {DOC_SUMMARY_COLS} FROM documents {'WHERE ' + ' AND '.join(where) if where else ''} ORDER BY id DESC LIMIT ?"
+    return [dict(zip(DOC_SUMMARY_COLS.split(', '), r)) for r in db().execute(sql, args + [limit])]
+
+def pdf_response(key, doc):
+    # ক্যাশ থেকে, নাহলে রেন্ডার করে; ETag সহ
+    if request.if_none_match.contains(key):
+        return Response(status=304, headers={'ETag': f'"{key}"'})
+    data = pdf_cache.get(key)
+    if data is None:
+        data = render_document(doc)
+        pdf_cache.put(key, data)
+    lap = metrics.phases('pdf_phase_seconds')
+    resp = send_file(io.BytesIO(data), mimetype='application/pdf', download_name=f"{doc['doc_type']}_{doc['doc_no']}.pdf", as_attachment=True, etag=key)
+    resp.headers['Cache-Control'] = 'private, no-cache'
+    lap('send')
+    return resp
+
+# ---- বিক্রির অ্যাগ্রিগেট (ডকুমেন্ট ফাইনাল / সংশোধন / বাতিলের সাথেই আপডেট) ----
+# দিন/মাস/কাস্টমার/প্রোডাক্ট ধরে যোগফল আলাদা টেবিলে, স্ট্যাটাস বদলের একই ট্রানজ্যাকশনে যোগ / বাদ হয়;
+# ড্যাশবোর্ড তাই শুধু প্রাইমারি কী / ইনডেক্স দেখে, আর্কাইভ যত বড়ই হোক পুরো স্ক্যান লাগে না।
+# টেবিল -> (কী কলাম, শেষ মান রাখা কলাম, যোগ হওয়া কলাম)
+SALES_TABLES = {
+    'sales_totals': (('doc_type',), (), ('docs', 'total', 'advance')),
+    'sales_daily': (('doc_type', 'day'), (), ('docs', 'total', 'advance')),
+    'sales_monthly': (('doc_type', 'month'), (), ('docs', 'total', 'advance')),
+    'sales_customers': (('doc_type', 'c_key'), ('c_name', 'c_mob'), ('docs', 'total', 'advance')),
+    'sales_products': (('doc_type', 'p_key'), ('name',), ('lines', 'pcs', 'total')),
+}
+
+def sales_upsert_sql(table):
+    keys, labels, sums = SALES_TABLES[table]
+    cols = keys + labels + sums
+    sets = [f"{c} = excluded.{c}" for c in labels] + [f"{c} = {c} + excluded.{c}" for c in sums]
+    return f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))}) ON CONFLICT({', '.join(keys)}) DO UPDATE SET {', '.join(sets)}"
+
+SALES_UPSERT = {t: sales_upsert_sql(t) for t in SALES_TABLES}
+
+def sales_deltas(doc_type, day, c_name, c_mob, advance, grand_total, items, into=None, sign=1):
+    # একটা ডকুমেন্ট থেকে প্রতিটি টেবিলে কী যোগ হবে: {টেবিল: {কী: [শেষ মান..., যোগফল...]}}
+    # into দিলে তার সাথেই মেশে (রিবিল্ডে পুরো আর্কাইভ এক dict এ জমে); sign=-1 = ডকুমেন্টটা বাদ দেয়া
+    out = into if into is not None else {t: {} for t in SALES_TABLES}
+    def add(table, key, labels, sums):
+        row = out[table].get(key)
+        if row is None: out[table][key] = list(labels) + list(sums)
+        else:
+            n = len(labels)
+            row[:n] = labels
+            for i, v in enumerate(sums, n): row[i] += v
+    doc = (sign, sign * grand_total, sign * advance)
+    add('sales_totals', (doc_type,), (), doc)
+    add('sales_daily', (doc_type, day), (), doc)
+    add('sales_monthly', (doc_type, day[:7]), (), doc)
+    add('sales_customers', (doc_type, mobile_key(c_mob) or product_key(c_name) or ""), (c_name, c_mob), doc)
+    # আইটেম অনেক বেশি (রিবিল্ডে লাখ লাখ), তাই এখানে add ছাড়া সরাসরি
+    products = out['sales_products']
+    for it in items:
+        title = str(it.get('title') or '').strip()
+        if not title: continue
+        key, pcs, total = (doc_type, product_key(title)), sign * safe_int(it.get('pcs')), sign * safe_float(it.get('total'))
+        row = products.get(key)
+        if row is None: products[key] = [title, sign, pcs, total]
+        else: row[0] = title; row[1] += sign; row[2] += pcs; row[3] += total
+    return out
+
+def document_sales(doc_type, row, into=None, sign=1):
+    # আর্কাইভের সারি (DOC_COLS ক্রমে) থেকে sales_deltas
+    day, c_name, c_mob, adv, total, items = row
+    return sales_deltas(doc_type, day, c_name, c_mob, adv, total, json.loads(zlib.decompress(items)), into, sign)
+
+def write_sales(conn, deltas):
+    for table, rows in deltas.items():
+        conn.executemany(SALES_UPSERT[table], [key + tuple(vals) for key, vals in rows.items()])
+        # বাদ দেয়ার পর যে সারির গণনা শূন্য হলো (যেমন সংশোধনে প্রোডাক্ট বদলালে) সেটা ড্যাশবোর্ডে আর থাকে না
+        keys, labels, sums = SALES_TABLES[table]
+        gone = [key for key, vals in rows.items() if vals[len(labels)] < 0]
+        if gone: conn.executemany(f"DELETE FROM {table} WHERE {' AND '.join(f'{k} = ?' for k in keys)} AND {sums[0]} <= 0", gone)
+
+def rebuild_sales(conn):
+    # আর্কাইভের উপর একবার স্ট্রিমিং পাস; মেমরিতে থাকে শুধু আলাদা দিন/কাস্টমার/প্রোডাক্টের যোগফল।
+    # কলারের ট্রানজ্যাকশনের ভেতরে চলে
+    for table in SALES_TABLES: conn.execute(f"DELETE FROM {table}")
+    deltas, n = {t: {} for t in SALES_TABLES}, 0
+    cur = conn.execute(f"SELECT doc_type, {DOC_COLS} FROM documents WHERE status = 'final' ORDER BY id")
+    while True:
+        rows = cur.fetchmany(500)
+        if not rows: break
+        for row in rows: document_sales(row[0], row[1:], deltas)
+        n += len(rows)
+    write_sales(conn, deltas)
+    return n
+
+SALES_SUMMARY_COLS = ('docs', 'total', 'advance')
+
+def sales_summary(doc_type, today=None):
+    # ড্যাশবোর্ড: আজ, এই মাস, মোট বাকি, সবচেয়ে বেশি বাকি থাকা কাস্টমার, সবচেয়ে বেশি বিক্রি হওয়া প্রোডাক্ট
+    conn = db()
+    today = today or datetime.now().date().isoformat()
+    def one(sql, *args):
+        row = conn.execute(sql, args).fetchone() or (0, 0.0, 0.0)
+        return dict(zip(SALES_SUMMARY_COLS, row), due=row[1] - row[2])
+    return {
+        'today': one("SELECT docs, total, advance FROM sales_daily WHERE doc_type = ? AND day = ?", doc_type, today),
+        'month': one("SELECT docs, total, advance FROM sales_monthly WHERE doc_type = ? AND month = ?", doc_type, today[:7]),
+        'all': one("SELECT docs, total, advance FROM sales_totals WHERE doc_type = ?", doc_type),
+        'top_dues': [dict(zip(('c_name', 'c_mob', 'docs', 'due'), r)) for r in conn.execute(
+            "SELECT c_name, c_mob, docs, total - advance FROM sales_customers WHERE doc_type = ? AND total - advance > 0 ORDER BY total - advance DESC LIMIT 5", (doc_type,))],
+        'top_products': [dict(zip(('name', 'lines', 'pcs', 'total'), r)) for r in conn.execute(
+            "SELECT name, lines, pcs, total FROM sales_products WHERE doc_type = ? ORDER BY total DESC LIMIT 5", (doc_type,))],
+    }
+
+SALES_GROUPS = {'day': 'sales_daily', 'month': 'sales_monthly'}
+
+def sales_report(doc_type, group, start=None, end=None):
+    # দিন / মাস ধরে সিরিজ (start-end সহ, ISO তারিখ বা মাস); কী রেঞ্জ স্ক্যান
+    table, col = SALES_GROUPS[group], group
+    where, args = ["doc_type = ?"], [doc_type]
+    if start: where.append(f"{col} >= ?"); args.append(start)
+    if end: where.append(f"{col} <= ?"); args.append(end)
+    return [dict(zip((col,) + SALES_SUMMARY_COLS, r)) for r in db().execute(
+        f"SELECT {col}, docs, total, advance FROM {table} WHERE {' AND '.join(where)} ORDER BY {col}", args)]
+
+# এখানে, কারণ মাইগ্রেশনে উপরের rebuild_sales লাগে
+init_db()
+
+# ---- খসড়া (ড্রাফট) কোটেশন/ইনভয়েস - সার্ভারে, আইটেম ধরে বদলায় ----
+# প্রতিটি আইটেম যোগ/এডিট/সরানো/মুছে ফেলা আলাদা ছোট রিকোয়েস্ট; মোট টাকা ও আইটেম সংখ্যা একই ট্রানজ্যাকশনে
+# ডেল্টা দিয়ে আপডেট হয়, তাই কোটেশন যত বড়ই হোক প্রতি রিকোয়েস্টের কাজ ও পেলোড একই থাকে।
+# ক্রম ঠিক রাখতে pos (ভগ্নাংশ) - সরালে শুধু ওই আইটেমের pos বদলায়।
+DRAFT_TTL = 30 * 24 * 3600 # এর বেশি দিন হাত না দেয়া খসড়া মুছে যায়
+DRAFT_COLS = "id, doc_type, c_name, c_mob, advance, note, total, n_items"
+DRAFT_ITEM_COLS = "id, title, description, feet, pcs, rate, total"
+
+def draft_item(data, old=None):
+    # ক্লায়েন্টের JSON থেকে শুধু জানা ফিল্ড; এডিটে যা আসেনি তা আগের মতোই থাকে
+    item = dict(old or {'title': '', 'desc': '', 'feet': 0, 'pcs': 0, 'rate': 0, 'total': 0})
+    for k in ('title', 'desc'):
+        if k in data: item[k] = str(data[k] or '')
+    for k in ('feet', 'rate', 'total'):
+        if k in data: item[k] = safe_float(data[k])
+    if 'pcs' in data: item['pcs'] = safe_int(data['pcs'])
+    item['title'] = item['title'].strip()
+    if not item['title']: raise ValueError("title is required")
+    return item
+
+def item_row(row):
+    return dict(zip(('id', 'title', 'desc', 'feet', 'pcs', 'rate', 'total'), row))
+
+def draft_summary(conn, draft_id):
+    row = conn.execute(f"SELECT {DRAFT_COLS} FROM drafts WHERE id = ?", (draft_id,)).fetchone()
+    return dict(zip(('id', 'doc_type', 'c_name', 'c_mob', 'adv', 'note', 'total', 'n_items'), row)) if row else None
+
+def create_draft(doc_type, c_name, c_mob):
+    conn = db()
+    draft_id = uuid.uuid4().hex
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        now = time.time()
+        conn.execute("DELETE FROM draft_items WHERE draft_id IN (SELECT id FROM drafts WHERE updated < ?)", (now - DRAFT_TTL,))
+        conn.execute("DELETE FROM drafts WHERE updated < ?", (now - DRAFT_TTL,))
+        conn.execute("INSERT INTO drafts (id, doc_type, c_name, c_mob, updated) VALUES (?, ?, ?, ?, ?)", (draft_id, doc_type, c_name, c_mob, now))
+        conn.execute("COMMIT")
+    except:
+        conn.execute("ROLLBACK"); raise
+    return draft_summary(conn, draft_id)
+
+def get_draft(draft_id):
+    # পুরো খসড়া আইটেম সহ (পেজ রিফ্রেশে ফিরিয়ে আনা ও PDF এর জন্য)
+    conn = db()
+    draft = draft_summary(conn, draft_id)
+    if draft is None: return None
+    draft['items'] = [item_row(r) for r in conn.execute(f"SELECT {DRAFT_ITEM_COLS} FROM draft_items WHERE draft_id = ? ORDER BY pos, id", (draft_id,))]
+    return draft
+
+def update_draft(draft_id, data):
+    sets, args = [], []
+    for field, col, conv in (('c_name', 'c_name', str), ('c_mob', 'c_mob', str), ('adv', 'advance', safe_float), ('note', 'note', str)):
+        if field in data: sets.append(f"{col} = ?"); args.append(conv(data[field] or ''))
+    conn = db()
+    cur = conn.execute(f"UPDATE drafts SET {', '.join(sets + ['updated = ?'])} WHERE id = ?", args + [time.time(), draft_id])
+    return draft_summary(conn, draft_id) if cur.rowcount else None
+
+def delete_draft(draft_id):
+    conn = db()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM draft_items WHERE draft_id = ?", (draft_id,))
+        found = conn.execute("DELETE FROM drafts WHERE id = ?", (draft_id,)).rowcount
+        conn.execute("COMMIT")
+    except:
+        conn.execute("ROLLBACK"); raise
+    return bool(found)
+
+def bump_draft(conn, draft_id, d_total, d_items):
+    # মোট টাকা ও সংখ্যা ডেল্টা দিয়ে; খসড়া না থাকলে False
+    return conn.execute("UPDATE drafts SET total = round(total + ?, 2), n_items = n_items + ?, updated = ? WHERE id = ?",
+                        (d_total, d_items, time.time(), draft_id)).rowcount == 1
+
+def add_draft_item(draft_id, data):
+    item = draft_item(data)
+    conn = db()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if not bump_draft(conn, draft_id, item['total'], 1):
+            conn.execute("ROLLBACK"); return None
+        pos = conn.execute("SELECT COALESCE(MAX(pos), 0) + 1 FROM draft_items WHERE draft_id = ?", (draft_id,)).fetchone()[0]
+        item_id = conn.execute("INSERT INTO draft_items (draft_id, pos, title, description, feet, pcs, rate, total) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                  (draft_id, pos, item['title'], item['desc'], item['feet'], item['pcs'], item['rate'], item['total'])).lastrowid
+        item = item_row(conn.execute(f"SELECT {DRAFT_ITEM_COLS} FROM draft_items WHERE id = ?", (item_id,)).fetchone())
+        conn.execute("COMMIT")
+    except:
+        conn.execute("ROLLBACK"); raise
+    return item, draft_summary(conn, draft_id)
+
+def update_draft_item(draft_id, item_id, data):
+    conn = db()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(f"SELECT {DRAFT_ITEM_COLS} FROM draft_items WHERE id = ? AND draft_id = ?", (item_id, draft_id)).fetchone()
+        if row is None:
+            conn.execute("ROLLBACK"); return None
+        old = item_row(row)
+        item = draft_item(data, old)
+        conn.execute("UPDATE draft_items SET title = ?, description = ?, feet = ?, pcs = ?, rate = ?, total = ? WHERE id = ?",
+                     (item['title'], item['desc'], item['feet'], item['pcs'], item['rate'], item['total'], item_id))
+        bump_draft(conn, draft_id, item['total'] - old['total'], 0)
+        item = item_row(conn.execute(f"SELECT {DRAFT_ITEM_COLS} FROM draft_items WHERE id = ?", (item_id,)).fetchone())
+        conn.execute("COMMIT")
+    except:
+        conn.execute("ROLLBACK"); raise
+    return item, draft_summary(conn, draft_id)
+
+def remove_draft_item(draft_id, item_id):
+    conn = db()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("DELETE FROM draft_items WHERE id = ? AND draft_id = ? RETURNING total", (item_id, draft_id)).fetchone()
+        if row is None:
+            conn.execute("ROLLBACK"); return None
+        bump_draft(conn, draft_id, -row[0], -1)
+        conn.execute("COMMIT")
+    except:
+        conn.execute("ROLLBACK"); raise
+    return draft_summary(conn, draft_id)
+
+def move_draft_item(draft_id, item_id, after_id=None):
+    # after_id এর ঠিক পরে (None হলে সবার আগে); দুই পাশের pos এর মাঝখানে বসে
+    conn = db()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("SELECT 1 FROM draft_items WHERE id = ? AND draft_id = ?", (item_id, draft_id)).fetchone() is None:
+            conn.execute("ROLLBACK"); return None
+        if after_id is None:
+            lo = None
+        else:
+            lo = conn.execute("SELECT pos FROM draft_items WHERE id = ? AND draft_id = ?", (after_id, draft_id)).fetchone()
+            if lo is None:
+                conn.execute("ROLLBACK"); return None
+            lo = lo[0]
+        hi = conn.execute("SELECT pos FROM draft_items WHERE draft_id = ? AND pos > ? AND id != ? ORDER BY pos LIMIT 1",
+                          (draft_id, float('-inf') if lo is None else lo, item_id)).fetchone()
+        hi = hi[0] if hi else None
+        if lo is None: pos = hi - 1 if hi is not None else 1
+        elif hi is None: pos = lo + 1
+        else: pos = (lo + hi) / 2
+        if lo is not None and hi is not None and not lo < pos < hi:
+            # বারবার একই জায়গায় সরালে ভগ্নাংশ ফুরিয়ে যায় - তখন একবার পুরো খসড়া নতুন করে নম্বর;
+            # ক্রম আগে পুরোটা পড়ে নিয়ে তারপর লেখা, যাতে লেখার মাঝে বদলানো pos আবার না পড়া হয়
+            ids = [r[0] for r in conn.execute("SELECT id FROM draft_items WHERE draft_id = ? ORDER BY pos, id", (draft_id,))]
+            conn.executemany("UPDATE draft_items SET pos = ? WHERE id = ?", [(n, i) for n, i in enumerate(ids, 1)])
+            conn.execute("COMMIT")
+            return move_draft_item(draft_id, item_id, after_id)
+        conn.execute("UPDATE draft_items SET pos = ? WHERE id = ?", (pos, item_id))
+        bump_draft(conn, draft_id, 0, 0)
+        conn.execute("COMMIT")
+    except:
+        conn.execute("ROLLBACK"); raise
+    return draft_summary(conn, draft_id)
+
+# ---- স্ট্যাটিক অ্যাসেট ও রেসপন্স কম্প্রেশন ----
+# CSS/JS লোকাল static/ থেকে; নামে কনটেন্টের হ্যাশ থাকায় ফাইল বদলালে URL ও বদলায়, তাই ব্রাউজার
+# এক বছর immutable ক্যাশ রাখে। ফাইলের gzip/brotli রূপ একবারই (সর্বোচ্চ লেভেলে) বানিয়ে মেমরিতে রাখা হয়,
+# HTML/JSON প্রতি রিকোয়েস্টে দ্রুত লেভেলে কম্প্রেস হয়।
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+ASSET_TYPES = {'.css': 'text/css; charset=utf-8', '.js': 'text/javascript; charset=utf-8'}
+CODINGS = ('br', 'gzip') if brotli else ('gzip',) # পছন্দের ক্রমে
+COMPRESS_TYPES = {'text/html', 'application/json', 'text/plain'}
+COMPRESS_MIN = 512 # এর ছোট রেসপন্স কম্প্রেস করে লাভ নেই
+
+def compress(data, coding, static=False):
+    if coding == 'br': return brotli.compress(data, quality=11 if static else 4)
+    return gzip.compress(data, 9 if static else 6, mtime=0)
+
+def accepted_coding():
+    return next((c for c in CODINGS if request.accept_encodings[c]), None)
+
+class Asset:
+    def __init__(self, body, content_type):
+        self.body, self.content_type = body, content_type
+        self.etag = hashlib.sha256(body).hexdigest()[:16]
+        self.encoded = {}
+
+    def encode(self, coding):
+        data = self.encoded.get(coding)
+        if data is None: data = self.encoded[coding] = compress(self.body, coding, static=True)
+        return data
+
+def load_assets():
+    # static/vendor/x.min.css -> /static/vendor/x.min.<hash>.css
+    assets, urls = {}, {}
+    for root, _, files in os.walk(STATIC_DIR):
+        for fname in files:
+            path = os.path.join(root, fname)
+            name = os.path.relpath(path, STATIC_DIR).replace(os.sep, '/')
+            stem, ext = os.path.splitext(name)
+            with open(path, 'rb') as f: asset = Asset(f.read(), ASSET_TYPES.get(ext, 'application/octet-stream'))
+            hashed = f"{stem}.{asset.etag[:10]}{ext}"
+            assets[hashed], urls[name] = asset, f"/static/{hashed}"
+    return assets, urls
+
+ASSETS, ASSET_URLS = load_assets()
+
+def asset_url(name):
+    return ASSET_URLS[name]
+
+app.jinja_env.globals['asset_url'] = asset_url
+
+# ---- ২. ফ্রন্টএন্ড লেআউট ----
+LAYOUT = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Mehedi Thai Admin</title>
+    <link href="{{ asset_url('vendor/bootstrap-5.3.8.min.css') }}" rel="stylesheet">
+    <link href="{{ asset_url('app.css') }}" rel="stylesheet">
+    <script src="{{ asset_url('app.js') }}" defer></script>
+</head>
+<body>
+    {% if session.logged_in %}
+    <div class="sidebar">
+        <h4 class="text-center py-4 text-white">Mehedi Thai</h4>
+        <a href="/dashboard">📊 Dashboard</a>
+        <a href="/customers">👥 Customers</a>
+        <a href="/products">📦 Products</a>
+        <a href="/create/Invoice">🧾 Create Invoice</a>
+        <a href="/create/Quotation">📄 Create Quotation</a>
+        <a href="/logout" class="text-danger mt-5">🚪 Logout</a>
+    </div>
+    {% endif %}
+    <div class="main">{% block content %}{% endblock %}</div>
+
+</body>
+</html>
+"""
+
+# প্রতিটি পেজ LAYOUT এক্সটেন্ড করে; ডাইনামিক ডাটা শুধু কনটেক্সট ভেরিয়েবল হিসেবে যায়,
+# তাই Jinja প্রতিটি টেমপ্লেট একবারই কম্পাইল করে ক্যাশে রাখে
+LOGIN_PAGE = """{% extends 'layout.html' %}{% block content %}
+        <div class="d-flex justify-content-center align-items-center" style="height: 80vh;">
+            <div class="card p-5 shadow" style="width: 400px;">
+                <h3 class="text-center mb-4">Admin Login</h3>
+                <form method="POST">
+                    <input name="user" class="form-control mb-3" placeholder="Username" required>
+                    <input name="pass" type="password" class="form-control mb-4" placeholder="Password" required>
+                    <button class="btn btn-primary w-100">Login</button>
+                </form>
+            </div>
+        </div>
+{% endblock %}"""
+
+DASHBOARD_PAGE = """{% extends 'layout.html' %}{% block content %}
+        <h2>Dashboard</h2>
+        <div class="row g-4 mt-2">
+            <div class="col-md-4"><div class="card p-4 bg-primary text-white"><h5>Products</h5><h2>{{ product_count }}</h2></div></div>
+            <div class="col-md-4"><div class="card p-4 bg-success text-white"><h5>Customers</h5><h2>{{ customer_count }}</h2></div></div>
+            <div class="col-md-4"><div class="card p-4 bg-warning"><h5>Outstanding Dues</h5><h2>{{ '{:,.0f}'.format(sales.all.due) }} Tk</h2></div></div>
+        </div>
+        <div class="row g-4 mt-2">
+            <div class="col-md-4"><div class="card p-4"><h5>Today's Sales</h5><h3>{{ '{:,.0f}'.format(sales.today.total) }} Tk</h3><small class="text-muted">{{ sales.today.docs }} invoices</small></div></div>
+            <div class="col-md-4"><div class="card p-4"><h5>This Month</h5><h3>{{ '{:,.0f}'.format(sales.month.total) }} Tk</h3><small class="text-muted">{{ sales.month.docs }} invoices, {{ '{:,.0f}'.format(sales.month.due) }} Tk due</small></div></div>
+            <div class="col-md-4"><div class="card p-4"><h5>Quotations This Month</h5><h3>{{ quotes.docs }}</h3><small class="text-muted">{{ '{:,.0f}'.format(quotes.total) }} Tk quoted</small></div></div>
+        </div>
+        <div class="row g-4 mt-2">
+            <div class="col-md-6"><div class="card p-4"><h5>Highest Dues</h5>
+                <table class="table table-sm mb-0"><thead><tr><th>Customer</th><th>Mobile</th><th class="text-end">Due</th></tr></thead><tbody>
+                {% for c in sales.top_dues %}<tr><td>{{ c.c_name }}</td><td>{{ c.c_mob }}</td><td class="text-end">{{ '{:,.0f}'.format(c.due) }}</td></tr>
+                {% else %}<tr><td colspan="3" class="text-muted">No dues</td></tr>{% endfor %}
+                </tbody></table></div></div>
+            <div class="col-md-6"><div class="card p-4"><h5>Top Products</h5>
+                <table class="table table-sm mb-0"><thead><tr><th>Product</th><th class="text-end">Lines</th><th class="text-end">Sales</th></tr></thead><tbody>
+                {% for p in sales.top_products %}<tr><td>{{ p.name }}</td><td class="text-end">{{ p.lines }}</td><td class="text-end">{{ '{:,.0f}'.format(p.total) }}</td></tr>
+                {% else %}<tr><td colspan="3" class="text-muted">No sales yet</td></tr>{% endfor %}
+                </tbody></table></div></div>
+        </div>
+{% endblock %}"""
+
+CREATE_PAGE = """{% extends 'layout.html' %}{% block content %}
+    <div id="section_customer" class="step-section active">
+        <div class="card p-5 shadow-sm" style="max-width: 600px; margin: auto;">
+            <h3 class="mb-4 text-center">Step 1: Select Customer</h3>
+            
+            <div class="mb-3">
+                <label class="form-label">Customer Name</label>
+                <input id="cust_input" class="form-control form-control-lg" list="c_list" oninput="checkCustomer()" placeholder="Type to search or add new...">
+                <datalist id="c_list"></datalist>
+            </div>
+
+            <div class="mb-4">
+                <label class="form-label">Mobile Number</label>
+                <input id="cust_mobile" class="form-control form-control-lg" placeholder="Enter mobile number">
+            </div>
+
+            <button onclick="confirmCustomer()" class="btn btn-primary btn-lg w-100">Next: Add Items &rarr;</button>
+        </div>
+    </div>
+
+    <div id="section_items" class="step-section">
+        <div class="row">
+            <div class="col-md-7">
+                <div class="card p-4 border-primary">
+                    <div class="d-flex justify-content-between mb-3">
+                        <h5>Add Item to {{ doc_type }}</h5>
+                        <span class="badge bg-info text-dark">Wizard</span>
+                    </div>
+
+                    <div id="step_1" class="wiz-step" style="display:block;">
+                        <label class="form-label fw-bold">1. Select Product</label>
+                        <input id="i_title" class="form-control form-control-lg mb-3" list="p_list" placeholder="Select product...">
+                        <datalist id="p_list">{{ product_options }}</datalist>
+                        <button class="btn btn-primary w-100" onclick="showItemStep('step_2')">Next: Description &rarr;</button>
+                    </div>
+
+                    <div id="step_2" class="wiz-step">
+                        <label class="form-label fw-bold">2. Description (Optional)</label>
+                        <textarea id="i_desc" class="form-control mb-3" rows="3" placeholder="Enter details..."></textarea>
+                        <div class="d-flex gap-2">
+                            <button class="btn btn-secondary w-50" onclick="showItemStep('step_1')">&larr; Back</button>
+                            <button class="btn btn-primary w-50" onclick="showItemStep('step_3')">Next: Price &rarr;</button>
+                        </div>
+                    </div>
+
+                    <div id="step_3" class="wiz-step">
+                        <label class="form-label fw-bold">3. Price Calculation</label>
+                        <div class="row g-2 mb-3">
+                            <div class="col-4"><label>Sq.Ft</label><input id="i_feet" type="number" class="form-control"></div>
+                            <div class="col-4"><label>Qty</label><input id="i_pcs" type="number" class="form-control"></div>
+                            <div class="col-4"><label>Rate</label><input id="i_rate" type="number" class="form-control"></div>
+                        </div>
+                        <label>Manual Total (Use if Rate is empty)</label>
+                        <input id="i_manual" type="number" class="form-control mb-3" placeholder="Manual amount">
+                        
+                        <div class="d-flex gap-2">
+                            <button class="btn btn-secondary w-50" onclick="showItemStep('step_2')">&larr; Back</button>
+                            <button class="btn btn-success w-50" onclick="saveItem()">+ Add to List</button>
+                        </div>
+                    </div>
+                </div>
+            </div>
+
+            <div class="col-md-5">
+                <div class="card p-4 h-100">
+                    <h5>Preview</h5>
+                    <div class="alert alert-light border p-2 mb-2">
+                        <strong>Name:</strong> <span id="display_c_name"></span><br>
+                        <strong>Mobile:</strong> <span id="display_c_mob"></span>
+                    </div>
+                    
+                    <div style="flex-grow: 1; overflow-y: auto; max-height: 300px;">
+                        <table class="table table-sm table-striped">
+                            <thead><tr><th>#</th><th>Item</th><th>Total</th><th></th></tr></thead>
+                            <tbody id="item_tbody"></tbody>
+                        </table>
+                    </div>
+                    
+                    <h4 class="text-end border-top pt-2">Total: <span id="g_total_disp">0</span></h4>
+                    
+                    <form method="POST" class="mt-3" id="pdf_form" data-doc-type="{{ doc_type }}" onsubmit="finishDraft()">
+                        <input type="hidden" name="c_name" id="final_c_name">
+                        <input type="hidden" name="c_mob" id="final_c_mob">
+                        <input type="hidden" name="items_data" id="hidden_json">
+                        <input type="hidden" name="issue_token" value="{{ issue_token }}">
+                        
+                        {% if doc_type == 'Invoice' %}<input name="adv" type="number" class="form-control mb-2" placeholder="Advance Payment">{% endif %}
+                        <input name="note" class="form-control mb-2" placeholder="Note (Warranty/Conditions)">
+                        
+                        <div class="form-check mb-2">
+                            <input class="form-check-input" type="checkbox" name="finalize" value="1" id="finalize" checked>
+                            <label class="form-check-label" for="finalize">Final (count in sales)</label>
+                        </div>
+                        <button class="btn btn-dark w-100 py-2">Download PDF</button>
+                        <button type="button" class="btn btn-link w-100 mt-1" onclick="discardDraft()">Start a new {{ doc_type }}</button>
+                    </form>
+                </div>
+            </div>
+        </div>
+    </div>
+{% endblock %}"""
+
+CUSTOMERS_PAGE = """{% extends 'layout.html' %}{% block content %}<h3>Customers</h3><form method='post' class='mb-3'><input name='n' placeholder='Name' class='form-control mb-2'><input name='m' placeholder='Mobile' class='form-control mb-2'><button class='btn btn-success'>Add</button></form><form method='post' action='/customers/import' enctype='multipart/form-data' class='d-flex gap-2 mb-3'><input type='file' name='file' accept='.csv' class='form-control'><button class='btn btn-outline-secondary'>Import CSV</button><a href='/customers/export.csv' class='btn btn-outline-secondary'>Export CSV</a></form><ul class='list-group'>{{ items }}</ul>{% include 'pager.html' %}{% endblock %}"""
+
+PRODUCTS_PAGE = """{% extends 'layout.html' %}{% block content %}<h3>Products</h3><form method='post' class='mb-3'><input name='p' placeholder='Product Name' class='form-control mb-2'><button class='btn btn-primary'>Add</button></form><form method='post' action='/products/import' enctype='multipart/form-data' class='d-flex gap-2 mb-3'><input type='file' name='file' accept='.csv' class='form-control'><button class='btn btn-outline-secondary'>Import CSV</button><a href='/products/export.csv' class='btn btn-outline-secondary'>Export CSV</a></form><ul class='list-group'>{{ items }}</ul>{% include 'pager.html' %}{% endblock %}"""
+
+PAGER = """{% if pages > 1 %}<nav class='mt-3'><ul class='pagination'>
+<li class='page-item {{ 'disabled' if page == 1 }}'><a class='page-link' href='?page={{ page - 1 }}'>&laquo;</a></li>
+<li class='page-item active'><span class='page-link'>{{ page }} / {{ pages }}</span></li>
+<li class='page-item {{ 'disabled' if page == pages }}'><a class='page-link' href='?page={{ page + 1 }}'>&raquo;</a></li>
+</ul></nav>{% endif %}"""
+
+TEMPLATES = {
+    'layout.html': LAYOUT,
+    'login.html': LOGIN_PAGE,
+    'dashboard.html': DASHBOARD_PAGE,
+    'create.html': CREATE_PAGE,
+    'customers.html': CUSTOMERS_PAGE,
+    'products.html': PRODUCTS_PAGE,
+    'pager.html': PAGER,
+}
+app.jinja_loader = DictLoader(TEMPLATES)
+
+# স্টার্টআপেই সব টেমপ্লেট কম্পাইল (প্রথম রিকোয়েস্টে দেরি হবে না)
+with app.app_context():
+    for name in TEMPLATES: app.jinja_env.get_template(name)
+
+# ---- ৩. রাউটস ----
+@app.before_request
+def start_timer():
+    g.t0 = time.perf_counter()
+
+@app.after_request
+def record_timing(resp):
+    t0 = g.pop('t0', None)
+    if t0 is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.observe('http_request_duration_seconds', (('endpoint', endpoint), ('method', request.method), ('status', str(resp.status_code))),
+                        time.perf_counter() - t0, LATENCY_BUCKETS)
+        metrics.maybe_flush()
+    return resp
+
+@app.after_request
+def compress_response(resp):
+    # টাইমিং এর আগে চলে (after_request উল্টো ক্রমে), তাই কম্প্রেশনের সময়ও মাপে আসে
+    if (resp.status_code != 200 or resp.direct_passthrough or resp.is_streamed or resp.mimetype not in COMPRESS_TYPES
+            or 'Content-Encoding' in resp.headers): return resp
+    data = resp.get_data()
+    if len(data) < COMPRESS_MIN: return resp
+    resp.vary.add('Accept-Encoding')
+    coding = accepted_coding()
+    if coding:
+        resp.set_data(compress(data, coding))
+        resp.headers['Content-Encoding'] = coding
+    return resp
+
+@app.route('/static/<path:name>')
+def static_asset(name):
+    asset = ASSETS.get(name)
+    if asset is None: return "Not found", 404
+    headers = {'ETag': f'"{asset.etag}"', 'Cache-Control': 'public, max-age=31536000, immutable', 'Vary': 'Accept-Encoding'}
+    if request.if_none_match.contains(asset.etag): return Response(status=304, headers=headers)
+    coding = accepted_coding()
+    if coding: headers['Content-Encoding'] = coding
+    return Response(asset.encode(coding) if coding else asset.body, content_type=asset.content_type, headers=headers)
+
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/')
+def index(): return redirect(url_for('dashboard'))
+
+@app.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        if request.form['user'] == USER_LOGIN and request.form['pass'] == USER_PASS:
+            session['logged_in'] = True; return redirect(url_for('dashboard'))
+    return render_template('login.html')
+
+@app.route('/dashboard')
+def dashboard():
+    if not session.get('logged_in'): return redirect(url_for('login'))
+    return render_template('dashboard.html', product_count=len(product_catalog.snapshot().rows), customer_count=len(customer_catalog.snapshot().rows),
+                           sales=sales_summary("Invoice"), quotes=sales_summary("Quotation")['month'])
+
+def document_response(token, doc):
+    # নম্বর দিয়ে আর্কাইভে রেখে PDF (async চাইলে জব আইডি); finalize চাইলে রেন্ডার সফল হওয়ার পর বিক্রিতে যোগ
+    doc['doc_no'] = issue_document(token, doc)
+    key, finalize = pdf_cache_key(doc), bool(request.args.get('finalize') or request.form.get('finalize'))
+    if (request.args.get('async') or request.form.get('async')) and pdf_cache.get(key) is None:
+        # অ্যাসিঙ্ক মোড: রেন্ডার পুলে পাঠিয়ে সাথে সাথে জব আইডি ফেরত
+        job_id = enqueue_job(doc, finalize)
+        if job_id is None:
+            return jsonify(error="render queue is full, retry shortly", pending=pending_jobs()), 503, {'Retry-After': '5'}
+        return jsonify(job_id=job_id, status_url=url_for('job_status', job_id=job_id)), 202
+    resp = pdf_response(key, doc)
+    if finalize: finalize_document(doc['doc_type'], doc['doc_no'])
+    return resp
+
+@app.route('/create/<doc_type>', methods=['GET', 'POST'])
+def create(doc_type):
+    if not session.get('logged_in'): return redirect(url_for('login'))
+    # নম্বর, আর্কাইভ আর বিক্রির যোগফল doc_type ধরে থাকে, তাই URL এ যা খুশি টাইপ চলবে না
+    if doc_type not in DOC_TYPES: return "Error: unknown document type", 404
+    
+    if request.method == 'POST':
+        try:
+            lap = metrics.phases('pdf_phase_seconds')
+            doc = {'items': json.loads(request.form.get('items_data', '[]')), 'doc_type': doc_type, 'c_name': request.form['c_name'], 'c_mob': request.form['c_mob'],
+                   'adv': safe_float(request.form.get('adv')), 'note': request.form['note'], 'doc_date': datetime.now().strftime("%d/%m/%Y")}
+            lap('parse')
+            err = items_error(doc['items'])
+            if err: return f"Error: {err}", 400
+            return document_response(request.form.get('issue_token') or new_issue_token(), doc)
+        except Exception as e: return f"Error: {e}"
+
+    return render_template('create.html', doc_type=doc_type, product_options=product_options_html(), issue_token=new_issue_token())
+
+@app.route('/api/bulk', methods=['POST'])
+def bulk_create():
+    # বডি: [{"doc_type", "c_name", "c_mob", "items": [...], "adv", "note", "token", "finalize"}, ...]
+    # finalize: true হলে ওই ডকুমেন্টের PDF ঠিকমতো রেন্ডার হওয়ার পর বিক্রিতে যোগ
+    # token (ঐচ্ছিক) দিলে একই ব্যাচ আবার পাঠালে একই নম্বর; না দিলে প্রতিটি ডকুমেন্ট নতুন নম্বর পায়
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    docs = request.get_json(silent=True)
+    if not isinstance(docs, list) or not docs: return jsonify(error="expected a JSON list of documents"), 400
+    if len(docs) > BULK_MAX_DOCS: return jsonify(error=f"at most {BULK_MAX_DOCS} documents per batch"), 400
+    # সব ডকুমেন্ট আগে যাচাই, তারপর নম্বর - মাঝপথে ভুল পেলে কোনো নম্বর খরচ হয় না
+    for i, doc in enumerate(docs, 1):
+        if not isinstance(doc, dict) or not isinstance(doc.get('items'), list) or not all(doc.get(k) and isinstance(doc[k], str) for k in ('doc_type', 'c_name', 'c_mob')):
+            return jsonify(error=f"document {i}: doc_type, c_name, c_mob (strings) and items are required"), 400
+        if not isinstance(doc.get('note', ''), str): return jsonify(error=f"document {i}: note must be a string"), 400
+        if doc['doc_type'] not in DOC_TYPES: return jsonify(error=f"document {i}: doc_type must be Invoice or Quotation"), 400
+        if not is_amount(doc.get('adv', 0)): return jsonify(error=f"document {i}: adv must be a number"), 400
+        err = items_error(doc['items'])
+        if err: return jsonify(error=f"document {i}: {err}"), 400
+        if not isinstance(doc.get('token') or '', str): return jsonify(error=f"document {i}: token must be a string"), 400
+    today = datetime.now().strftime("%d/%m/%Y")
+    for doc in docs:
+        doc.update(adv=safe_float(doc.get('adv')), note=doc.get('note', ''), doc_date=today)
+        doc['doc_no'] = issue_document(doc.pop('token', None) or new_issue_token(), doc)
+    return Response(stream_with_context(stream_bulk_zip(docs)), mimetype='application/zip',
+                    headers={'Content-Disposition': 'attachment; filename=documents.zip'})
+
+@app.route('/api/jobs')
+def job_queue():
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    return jsonify(pending=pending_jobs(), capacity=JOB_QUEUE_MAX)
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    job = get_job(job_id)
+    if job is None: return jsonify(error="unknown job"), 404
+    if job['status'] == 'done': job['download_url'] = url_for('job_download', job_id=job_id)
+    return jsonify(job)
+
+@app.route('/api/jobs/<job_id>/pdf')
+def job_download(job_id):
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    data = job_pdf(job_id)
+    if data is None: return jsonify(error="job is not finished"), 409
+    return send_file(io.BytesIO(data), mimetype='application/pdf', download_name=f"{get_job(job_id)['doc_type']}.pdf", as_attachment=True)
+
+@app.route('/api/documents')
+def document_search():
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    limit = min(max(safe_int(request.args.get('limit')) or 50, 1), 500)
+    return jsonify(find_documents(request.args.get('mobile'), request.args.get('date'), request.args.get('doc_type'), limit))
+
+@app.route('/api/documents/<doc_type>/<int:doc_no>/pdf')
+def document_pdf(doc_type, doc_no):
+    # আর্কাইভ থেকে আবার রেন্ডার (মূল তারিখ ও নম্বর সহ)
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    found = load_document(doc_type, doc_no)
+    if found is None: return jsonify(error="unknown document"), 404
+    return pdf_response(*found)
+
+@app.route('/api/documents/<doc_type>/<int:doc_no>/<action>', methods=['POST'])
+def document_status(doc_type, doc_no, action):
+    # finalize: ডাউনলোডের সময় না করা থাকলে পরে বিক্রিতে যোগ; void: ভুল / বদলে দেয়া ডকুমেন্ট বিক্রি থেকে বাদ
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    change = {'finalize': finalize_document, 'void': void_document}.get(action)
+    if change is None: return jsonify(error="unknown action"), 404
+    status = change(doc_type, doc_no)
+    if status is None: return jsonify(error="unknown document"), 404
+    if action == 'finalize' and status == 'void': return jsonify(error="document was voided", status=status), 409
+    return jsonify(doc_type=doc_type, doc_no=doc_no, status=status)
+
+@app.route('/api/drafts', methods=['POST'])
+def draft_new():
+    # বডি: {"doc_type", "c_name", "c_mob"}
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    data = request.get_json(silent=True) or {}
+    if data.get('doc_type') not in DOC_TYPES: return jsonify(error="doc_type must be Invoice or Quotation"), 400
+    return jsonify(create_draft(data['doc_type'], str(data.get('c_name') or ''), str(data.get('c_mob') or ''))), 201
+
+@app.route('/api/drafts/<draft_id>', methods=['GET', 'PATCH', 'DELETE'])
+def draft_detail(draft_id):
+    # GET: আইটেম সহ পুরো খসড়া; PATCH: c_name / c_mob / adv / note
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    if request.method == 'DELETE':
+        return ('', 204) if delete_draft(draft_id) else (jsonify(error="unknown draft"), 404)
+    draft = update_draft(draft_id, request.get_json(silent=True) or {}) if request.method == 'PATCH' else get_draft(draft_id)
+    if draft is None: return jsonify(error="unknown draft"), 404
+    return jsonify(draft)
+
+@app.route('/api/drafts/<draft_id>/items', methods=['POST'])
+def draft_item_add(draft_id):
+    # বডি: একটা আইটেম {"title", "desc", "feet", "pcs", "rate", "total"}; উত্তরে আইটেম (id সহ) ও নতুন মোট
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    try: found = add_draft_item(draft_id, request.get_json(silent=True) or {})
+    except ValueError as e: return jsonify(error=str(e)), 400
+    if found is None: return jsonify(error="unknown draft"), 404
+    item, draft = found
+    return jsonify(item=item, draft=draft), 201
+
+@app.route('/api/drafts/<draft_id>/items/<int:item_id>', methods=['PATCH', 'DELETE'])
+def draft_item_edit(draft_id, item_id):
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    if request.method == 'DELETE':
+        draft = remove_draft_item(draft_id, item_id)
+        return jsonify(draft=draft) if draft else (jsonify(error="unknown item"), 404)
+    try: found = update_draft_item(draft_id, item_id, request.get_json(silent=True) or {})
+    except ValueError as e: return jsonify(error=str(e)), 400
+    if found is None: return jsonify(error="unknown item"), 404
+    item, draft = found
+    return jsonify(item=item, draft=draft)
+
+@app.route('/api/drafts/<draft_id>/items/<int:item_id>/move', methods=['POST'])
+def draft_item_move(draft_id, item_id):
+    # বডি: {"after": আইটেম id অথবা null (সবার আগে)}
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    after = (request.get_json(silent=True) or {}).get('after')
+    draft = move_draft_item(draft_id, item_id, None if after is None else safe_int(after))
+    if draft is None: return jsonify(error="unknown item"), 404
+    return jsonify(draft=draft)
+
+@app.route('/api/drafts/<draft_id>/pdf', methods=['POST'])
+def draft_pdf(draft_id):
+    # জমা থাকা খসড়া থেকে PDF; ফর্মে adv / note এলে আগে খসড়ায় লেখা হয়
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    fields = {k: request.form[k] for k in ('adv', 'note') if k in request.form}
+    if fields: update_draft(draft_id, fields)
+    draft = get_draft(draft_id)
+    if draft is None: return jsonify(error="unknown draft"), 404
+    items = [{k: it[k] for k in ('title', 'desc', 'feet', 'pcs', 'rate', 'total')} for it in draft['items']]
+    # খসড়ার আইডিই তার ইস্যু token: একই খসড়া আবার ডাউনলোড করলে একই নম্বর
+    return document_response('draft-' + draft_id, {'items': items, 'doc_type': draft['doc_type'], 'c_name': draft['c_name'], 'c_mob': draft['c_mob'],
+                              'adv': draft['adv'], 'note': draft['note'], 'doc_date': datetime.now().strftime("%d/%m/%Y")})
+
+@app.route('/api/reports/sales')
+def sales_report_api():
+    # ?group=day|month&doc_type=Invoice&from=2026-10-01&to=2026-10-31 (মাসে 2026-10)
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    group = request.args.get('group', 'day')
+    if group not in SALES_GROUPS: return jsonify(error="group must be day or month"), 400
+    return jsonify(sales_report(request.args.get('doc_type', 'Invoice'), group, request.args.get('from'), request.args.get('to')))
+
+@app.route('/api/customers/search')
+def customer_search():
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    limit = min(max(safe_int(request.args.get('limit')) or 10, 1), 50)
+    return jsonify(search_customers(request.args.get('q', ''), limit))
+
+@app.route('/customers', methods=['GET', 'POST'])
+def customers():
+    if request.method == 'POST': add_customer(request.form['n'], request.form['m'])
+    items, page, pages = customer_list_html(safe_int(request.args.get('page')) or 1)
+    return render_template('customers.html', items=items, page=page, pages=pages)
+
+@app.route('/customers/import', methods=['POST'])
+def customers_import():
+    # CSV কলাম: name,mobile
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    report = import_csv(upload_lines(), customer_row, upsert_customer)
+    return jsonify(report), 400 if 'error' in report else 200
+
+@app.route('/customers/export.csv')
+def customers_export():
+    if not session.get('logged_in'): return redirect(url_for('login'))
+    return Response(stream_with_context(export_csv(["name", "mobile"], "SELECT n, m FROM customers ORDER BY id")), mimetype='text/csv',
+                    headers={'Content-Disposition': 'attachment; filename=customers.csv'})
+
+@app.route('/products/import', methods=['POST'])
+def products_import():
+    # CSV কলাম: name
+    if not session.get('logged_in'): return jsonify(error="login required"), 401
+    report = import_csv(upload_lines(), product_row, upsert_product)
+    return jsonify(report), 400 if 'error' in report else 200
+
+@app.route('/products/export.csv')
+def products_export():
+    if not session.get('logged_in'): return redirect(url_for('login'))
+    return Response(stream_with_context(export_csv(["name"], "SELECT name FROM products ORDER BY id")), mimetype='text/csv',
+                    headers={'Content-Disposition': 'attachment; filename=products.csv'})
+
+@app.route('/products', methods=['GET', 'POST'])
+def products():
+    if request.method == 'POST': add_product(request.form['p'])
+    items, page, pages = product_list_html(safe_int(request.args.get('page')) or 1)
+    return render_template('products.html', items=items, page=page, pages=pages)
+
+# ---- ৪. অ্যাপ ফ্যাক্টরি (gunicorn --preload) ----
+# DB ও টেমপ্লেট import এর সময়েই তৈরি হয় (সস্তা); ভারী PDF অংশ আর স্ট্যাটিক ফাইলের কম্প্রেশন এখানে আগেভাগে।
+# gunicorn.conf.py এ preload_app থাকায় এটা মাস্টারে একবার চলে, max-requests এ নতুন ওয়ার্কারও
+# তৈরি অবস্থাতেই fork হয়। PDF_PRELOAD=0 দিলে ReportLab শুধু প্রথম PDF এর সময় লোড হয়।
+def create_app(preload_pdf=None):
+    if preload_pdf is None: preload_pdf = os.environ.get('PDF_PRELOAD', '1') == '1'
+    if preload_pdf: warm_pdf()
+    for asset in ASSETS.values():
+        for coding in CODINGS: asset.encode(coding)
+    close_db() # ওয়ার্ম আপে কিছু খুললেও ওয়ার্কাররা নিজেরা নতুন কানেকশন নেবে
+    return app
+
+@app.cli.command('rebuild-sales')
+def rebuild_sales_command():
+    """আর্কাইভ থেকে বিক্রির অ্যাগ্রিগেট নতুন করে হিসাব: flask --app app rebuild-sales"""
+    conn = db()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        n = rebuild_sales(conn)
+        conn.execute("COMMIT")
+    except:
+        conn.execute("ROLLBACK"); raise
+    print(f"rebuilt sales aggregates from {n} documents")
+
+if __name__ == '__main__':
+    create_app().run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
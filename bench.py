@@ -0,0 +1,166 @@
+"""generate_pdf ও Flask রাউটের বেঞ্চমার্ক।
+
+    python bench.py                                   # সব ওয়ার্কলোড, ফলাফল bench_results.json এ
+    python bench.py --quick                           # কম iteration (CI / দ্রুত চেক)
+    python bench.py --only pdf                        # নাম দিয়ে ফিল্টার
+    python bench.py --save-baseline                   # bench_baseline.json এ বর্তমান ফলাফল রাখা
+    python bench.py --baseline bench_baseline.json --threshold 0.25
+
+বেসলাইন দিলে কোনো ওয়ার্কলোডের p50 threshold (অনুপাত) এর বেশি ধীর হলে exit code 1।
+প্রতিটি ওয়ার্কলোডের জন্য p50/p95/p99 (ms), throughput (ops/s) ও tracemalloc peak (KB) রিপোর্ট হয়।
+"""
+import os, sys, time, json, math, random, tempfile, argparse, platform, tracemalloc
+
+# আলাদা টেম্প ডাটাবেজ ও ক্যাশ বন্ধ, যাতে আসল ডাটা নষ্ট না হয় আর প্রতিবার আসল কাজ মাপা হয়
+os.environ.setdefault('DB_PATH', os.path.join(tempfile.mkdtemp(), 'bench.db'))
+os.environ['PDF_CACHE_MAX_BYTES'] = '0'
+os.environ.pop('PDF_CACHE_DIR', None)
+
+import app as shop
+
+SEED = 1234
+LARGE_CUSTOMERS = 20000
+LARGE_PRODUCTS = 2000
+
+# ---- ডাটা ----
+def make_items(n, desc_lines=2, desc_len=30, rng=None):
+    rng = rng or random.Random(SEED)
+    items = []
+    for i in range(n):
+        feet, rate = rng.randint(5, 80), rng.choice([250, 320, 450, 0])
+        pcs = rng.randint(1, 6)
+        desc = "\n".join("x" * desc_len for _ in range(desc_lines)) if desc_lines and i % 2 == 0 else ""
+        items.append({'title': f"Thai Window {i}", 'desc': desc, 'feet': feet, 'pcs': pcs, 'rate': rate,
+                      'total': feet * rate if rate else rng.randint(500, 9000)})
+    return items
+
+def seed_catalog():
+    conn = shop.db()
+    if shop.count_customers() >= LARGE_CUSTOMERS: return
+    conn.execute("BEGIN")
+    conn.executemany("INSERT INTO customers (n, m) VALUES (?, ?)", [(f"Customer {i}", f"017{i:08d}") for i in range(LARGE_CUSTOMERS)])
+    conn.executemany("INSERT INTO products (name) VALUES (?)", [(f"Product {i}",) for i in range(LARGE_PRODUCTS)])
+    conn.execute("COMMIT")
+
+def login(client):
+    client.post('/login', data={'user': shop.USER_LOGIN, 'pass': shop.USER_PASS})
+
+# ---- ওয়ার্কলোড: প্রতিটি একটা (name, fn, iterations) - fn একবার কাজটা করে ----
+def pdf_workload(n_items, **kw):
+    items = make_items(n_items, **kw)
+    return lambda: shop.generate_pdf(items, "Invoice", "Customer 1", "01700000001", 1000, "1 year warranty", "16/10/2026", 1)
+
+def wrap_workload(n_chars, rng=None):
+    # ক্যাশ ছাড়া (wrap_lines) আসল র‍্যাপের খরচ
+    rng = rng or random.Random(SEED)
+    words = []
+    while sum(map(len, words)) + len(words) < n_chars: words.append("x" * rng.randint(1, 12))
+    text = " ".join(words)[:n_chars]
+    return lambda: shop.wrap_lines(text, shop.DESC_FONT, shop.DESC_SIZE, shop.DESC_W)
+
+def route_workload(client, path):
+    def run():
+        r = client.get(path)
+        assert r.status_code == 200, (path, r.status_code)
+    return run
+
+def flow_workload(app, n_items):
+    items_data = json.dumps(make_items(n_items))
+    counter = iter(range(10**9))
+    def run():
+        client = app.test_client()
+        login(client)
+        assert client.get('/create/Invoice').status_code == 200
+        # issue_token ছাড়া প্রতিটি POST নতুন ডকুমেন্ট (নতুন নম্বর, তাই PDF ক্যাশেও মিস)
+        r = client.post('/create/Invoice', data={'items_data': items_data, 'c_name': "Customer 1", 'c_mob': "01700000001",
+                                                 'adv': "500", 'note': f"run {next(counter)}", 'finalize': "1"})
+        assert r.status_code == 200 and r.data[:4] == b'%PDF', r.data[:200]
+    return run
+
+def workloads(quick):
+    k = 0.2 if quick else 1
+    it = lambda n: max(3, int(n * k))
+    seed_catalog()
+    client = shop.app.test_client(); login(client)
+    return [
+        ("pdf/items=1", pdf_workload(1), it(200)),
+        ("pdf/items=10", pdf_workload(10), it(100)),
+        ("pdf/items=100", pdf_workload(100), it(30)),
+        ("pdf/items=1000", pdf_workload(1000), it(5)),
+        ("pdf/long-desc items=50 lines=20", pdf_workload(50, desc_lines=20, desc_len=60), it(20)),
+        ("pdf/long-desc items=10 len=2000", pdf_workload(10, desc_lines=1, desc_len=2000), it(30)),
+        ("pdf/long-desc items=5 len=10000", pdf_workload(5, desc_lines=1, desc_len=10000), it(10)),
+        ("layout/wrap len=200", wrap_workload(200), it(2000)),
+        ("layout/wrap len=5000", wrap_workload(5000), it(300)),
+        ("layout/wrap len=50000", wrap_workload(50000), it(30)),
+        ("route/dashboard", route_workload(client, '/dashboard'), it(300)),
+        (f"route/create customers={LARGE_CUSTOMERS} products={LARGE_PRODUCTS}", route_workload(client, '/create/Invoice'), it(100)),
+        (f"route/customers customers={LARGE_CUSTOMERS}", route_workload(client, '/customers'), it(10)),
+        (f"route/products products={LARGE_PRODUCTS}", route_workload(client, '/products'), it(50)),
+        ("route/customer-search", route_workload(client, '/api/customers/search?q=customer 12'), it(300)),
+        ("flow/login-create-download items=20", flow_workload(shop.app, 20), it(30)),
+    ]
+
+# ---- মাপা ----
+def percentile(sorted_vals, p):
+    # nearest-rank
+    if not sorted_vals: return 0.0
+    return sorted_vals[max(0, math.ceil(p / 100 * len(sorted_vals)) - 1)]
+
+def measure(fn, iterations, warmup=2):
+    for _ in range(warmup): fn()
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t = time.perf_counter(); fn(); samples.append((time.perf_counter() - t) * 1000)
+    wall = time.perf_counter() - start
+    # মেমরি আলাদা একটা রানে, কারণ tracemalloc টাইমিং ধীর করে
+    tracemalloc.start(); fn(); peak = tracemalloc.get_traced_memory()[1]; tracemalloc.stop()
+    samples.sort()
+    return {'iterations': iterations, 'p50_ms': percentile(samples, 50), 'p95_ms': percentile(samples, 95),
+            'p99_ms': percentile(samples, 99), 'throughput_ops': iterations / wall if wall else 0.0, 'peak_kb': peak / 1024}
+
+def compare(results, baseline, threshold):
+    # p50 দিয়ে তুলনা; বেসলাইনে না থাকা ওয়ার্কলোড বাদ
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get('results', {}).get(name)
+        if base and base['p50_ms'] > 0 and r['p50_ms'] > base['p50_ms'] * (1 + threshold):
+            regressions.append((name, base['p50_ms'], r['p50_ms']))
+    return regressions
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--quick', action='store_true')
+    ap.add_argument('--only', help="শুধু নামে এই লেখা থাকা ওয়ার্কলোড")
+    ap.add_argument('--out', default='bench_results.json')
+    ap.add_argument('--baseline', help="তুলনার জন্য আগের ফলাফলের JSON")
+    ap.add_argument('--threshold', type=float, default=0.25, help="p50 কতটা (অনুপাত) ধীর হলে ফেল, ডিফল্ট 0.25")
+    ap.add_argument('--save-baseline', action='store_true', help="ফলাফল bench_baseline.json এও লেখা")
+    args = ap.parse_args(argv)
+
+    random.seed(SEED)
+    results = {}
+    print(f"{'workload':<52} {'p50':>9} {'p95':>9} {'p99':>9} {'ops/s':>9} {'peakKB':>9}")
+    for name, fn, iterations in workloads(args.quick):
+        if args.only and args.only not in name: continue
+        r = results[name] = measure(fn, iterations)
+        print(f"{name:<52} {r['p50_ms']:9.2f} {r['p95_ms']:9.2f} {r['p99_ms']:9.2f} {r['throughput_ops']:9.1f} {r['peak_kb']:9.0f}")
+
+    report = {'python': platform.python_version(), 'platform': platform.platform(), 'quick': args.quick,
+              'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}
+    with open(args.out, 'w') as f: json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open('bench_baseline.json', 'w') as f: json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f: baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, old, new in regressions:
+            print(f"REGRESSION {name}: p50 {old:.2f} -> {new:.2f} ms (+{(new / old - 1) * 100:.0f}%)")
+        if regressions: return 1
+        print(f"no regressions beyond {args.threshold:.0%} vs {args.baseline}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
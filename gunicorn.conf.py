@@ -0,0 +1,23 @@
+# gunicorn নিজে থেকেই এই ফাইল পড়ে, তাই শুধু `gunicorn` চালালেই হবে
+import os
+import shutil
+import tempfile
+
+wsgi_app = "app:create_app()"
+# মাস্টারে একবার import + ওয়ার্ম আপ; ওয়ার্কাররা fork এ মেমরি copy-on-write শেয়ার করে
+preload_app = True
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+# বাল্ক PDF এর প্রসেস পুল প্রতি ওয়ার্কারে আলাদা; PDF_POOL_WORKERS না দিলে app.py CPU সংখ্যা / WEB_CONCURRENCY নেয়,
+# তাই workers এর সাথে একই মান যেন app এও পৌঁছায়
+os.environ.setdefault('WEB_CONCURRENCY', str(workers))
+max_requests = int(os.environ.get('MAX_REQUESTS', 1000))
+max_requests_jitter = 50
+
+# /metrics যেন সব ওয়ার্কার ও PDF পুলের যোগফল দেখায়: প্রতিটি চালুতে নতুন খালি ডিরেক্টরি (app import এর আগেই সেট হতে হবে)
+_own_metrics_dir = 'METRICS_DIR' not in os.environ
+if _own_metrics_dir:
+    os.environ['METRICS_DIR'] = tempfile.mkdtemp(prefix='mehedi-metrics-')
+
+def on_exit(server):
+    if _own_metrics_dir: shutil.rmtree(os.environ['METRICS_DIR'], ignore_errors=True)
@@ -0,0 +1,182 @@
+// কাস্টমার সার্চ (সার্ভার থেকে, টাইপ করার সাথে সাথে)
+let custTimer = null;
+function checkCustomer() {
+    clearTimeout(custTimer);
+    custTimer = setTimeout(() => {
+        const inputName = document.getElementById('cust_input').value;
+        if(!inputName.trim()) return;
+        fetch('/api/customers/search?q=' + encodeURIComponent(inputName))
+            .then(r => r.json())
+            .then(found => {
+                const list = document.getElementById('c_list');
+                list.innerHTML = '';
+                found.forEach(c => { const o = document.createElement('option'); o.value = c.n; o.label = c.m; list.appendChild(o); });
+                const exact = found.find(c => c.n === inputName);
+                if(exact) document.getElementById('cust_mobile').value = exact.m;
+            });
+    }, 150);
+}
+
+// ---- সার্ভারে খসড়া: প্রতিটি বদল আলাদা ছোট রিকোয়েস্ট, রিফ্রেশ করলেও কিছু হারায় না ----
+let draftId = null;
+let editingId = null;
+
+function draftKey() { return 'draft_' + document.getElementById('pdf_form').dataset.docType; }
+
+function api(method, url, body) {
+    return fetch(url, {method, headers: {'Content-Type': 'application/json'}, body: body === undefined ? undefined : JSON.stringify(body)})
+        .then(r => r.ok ? (r.status === 204 ? null : r.json()) : r.json().then(e => Promise.reject(e.error || r.statusText)));
+}
+
+function useDraft(draft) {
+    draftId = draft.id;
+    localStorage.setItem(draftKey(), draft.id);
+    document.getElementById('pdf_form').action = '/api/drafts/' + draft.id + '/pdf';
+}
+
+function showCustomer(name, mobile) {
+    document.getElementById('final_c_name').value = name;
+    document.getElementById('final_c_mob').value = mobile;
+    document.getElementById('display_c_name').innerText = name;
+    document.getElementById('display_c_mob').innerText = mobile;
+    document.getElementById('section_customer').classList.remove('active');
+    document.getElementById('section_items').classList.add('active');
+}
+
+// পেজ খুললে আগের অসমাপ্ত খসড়া ফিরিয়ে আনা
+function restoreDraft() {
+    const form = document.getElementById('pdf_form');
+    if(!form) return;
+    const saved = localStorage.getItem(draftKey());
+    if(!saved) return;
+    api('GET', '/api/drafts/' + saved).then(draft => {
+        useDraft(draft);
+        document.getElementById('cust_input').value = draft.c_name;
+        document.getElementById('cust_mobile').value = draft.c_mob;
+        if(form.adv && draft.adv) form.adv.value = draft.adv;
+        form.note.value = draft.note;
+        itemList = draft.items;
+        renderTable(draft.total);
+        showCustomer(draft.c_name, draft.c_mob);
+    }).catch(() => localStorage.removeItem(draftKey()));
+}
+document.addEventListener('DOMContentLoaded', restoreDraft);
+
+function discardDraft() {
+    if(draftId && !confirm("Discard this draft?")) return;
+    if(draftId) api('DELETE', '/api/drafts/' + draftId).catch(() => {});
+    localStorage.removeItem(draftKey());
+    location.reload();
+}
+
+// কাস্টমার কনফার্ম করে আইটেমে যাওয়া
+function confirmCustomer() {
+    const name = document.getElementById('cust_input').value;
+    const mobile = document.getElementById('cust_mobile').value;
+
+    if(!name || !mobile) { alert("Customer Name and Mobile are required!"); return; }
+
+    const form = document.getElementById('pdf_form');
+    const req = draftId ? api('PATCH', '/api/drafts/' + draftId, {c_name: name, c_mob: mobile})
+                        : api('POST', '/api/drafts', {doc_type: form.dataset.docType, c_name: name, c_mob: mobile});
+    // সার্ভারে না গেলেও আগের মতো ব্রাউজারেই লিস্ট রেখে কাজ চলবে
+    req.then(useDraft).catch(() => {}).finally(() => showCustomer(name, mobile));
+}
+
+// আইটেম উইজার্ড স্টেপ কন্ট্রোল
+function showItemStep(id) {
+    document.querySelectorAll('.wiz-step').forEach(el => el.style.display = 'none');
+    document.getElementById(id).style.display = 'block';
+}
+
+// আইটেম লিস্ট
+let itemList = [];
+const ITEM_INPUTS = {title: 'i_title', desc: 'i_desc', feet: 'i_feet', pcs: 'i_pcs', rate: 'i_rate', total: 'i_manual'};
+
+function saveItem() {
+    const title = document.getElementById('i_title').value;
+    const desc = document.getElementById('i_desc').value;
+    const feet = parseFloat(document.getElementById('i_feet').value) || 0;
+    const pcs = parseInt(document.getElementById('i_pcs').value) || 0;
+    const rate = parseFloat(document.getElementById('i_rate').value) || 0;
+    const manual = parseFloat(document.getElementById('i_manual').value) || 0;
+
+    if(!title) { alert("Title is required"); return; }
+    if(feet==0 && pcs==0 && manual==0) { alert("Please enter Feet, Pcs or Manual Total"); return; }
+
+    let total = 0;
+    if(rate > 0) total = (feet > 0 ? feet : pcs) * rate;
+    else total = manual;
+
+    const item = {title, desc, feet, pcs, rate, total};
+    const idx = editingId === null ? -1 : itemList.findIndex(it => it.id === editingId);
+    const done = (saved, gTotal) => {
+        if(idx >= 0) itemList[idx] = saved; else itemList.push(saved);
+        renderTable(gTotal);
+        resetItemForm();
+    };
+    if(!draftId) { done(item); return; }
+    const req = idx >= 0 ? api('PATCH', `/api/drafts/${draftId}/items/${editingId}`, item)
+                         : api('POST', `/api/drafts/${draftId}/items`, item);
+    req.then(r => done(r.item, r.draft.total)).catch(e => alert("Could not save item: " + e));
+}
+
+function resetItemForm() {
+    // ইনপুট রিসেট
+    Object.values(ITEM_INPUTS).forEach(id => document.getElementById(id).value = '');
+    editingId = null;
+    // প্রথম স্টেপে ফেরত
+    showItemStep('step_1');
+}
+
+function editItem(idx) {
+    const it = itemList[idx];
+    editingId = it.id === undefined ? null : it.id;
+    for(const [k, id] of Object.entries(ITEM_INPUTS)) document.getElementById(id).value = it[k] || '';
+    if(it.rate > 0) document.getElementById('i_manual').value = '';
+    if(editingId === null) itemList.splice(idx, 1), renderTable(); // খসড়া ছাড়া: সরিয়ে আবার যোগ
+    showItemStep('step_1');
+}
+
+function removeItem(idx) {
+    const done = gTotal => { itemList.splice(idx, 1); renderTable(gTotal); };
+    if(!draftId) { done(); return; }
+    api('DELETE', `/api/drafts/${draftId}/items/${itemList[idx].id}`).then(r => done(r.draft.total)).catch(e => alert("Could not remove item: " + e));
+}
+
+function moveItem(idx, dir) {
+    const to = idx + dir;
+    if(to < 0 || to >= itemList.length) return;
+    const done = gTotal => { const [it] = itemList.splice(idx, 1); itemList.splice(to, 0, it); renderTable(gTotal); };
+    if(!draftId) { done(); return; }
+    // সার্ভারে শুধু "কার পরে" পাঠানো হয়
+    const rest = itemList.filter((_, i) => i !== idx);
+    const after = to > 0 ? rest[to - 1].id : null;
+    api('POST', `/api/drafts/${draftId}/items/${itemList[idx].id}/move`, {after}).then(r => done(r.draft.total)).catch(e => alert("Could not move item: " + e));
+}
+
+function escapeHtml(s) {
+    return String(s).replace(/[&<>"']/g, ch => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[ch]));
+}
+
+function renderTable(gTotal) {
+    // মোট টাকা সার্ভার থেকে এলে সেটাই, নাহলে (খসড়া ছাড়া) এখানে যোগ
+    if(gTotal === undefined) gTotal = itemList.reduce((sum, it) => sum + it.total, 0);
+    let html = '';
+    itemList.forEach((it, idx) => {
+        html += `<tr><td>${idx+1}</td><td><b>${escapeHtml(it.title)}</b></td><td>${it.total.toFixed(0)}</td><td class="text-nowrap">`
+              + `<button type="button" class="btn btn-sm btn-link p-0 me-1" onclick="moveItem(${idx}, -1)">&uarr;</button>`
+              + `<button type="button" class="btn btn-sm btn-link p-0 me-1" onclick="moveItem(${idx}, 1)">&darr;</button>`
+              + `<button type="button" class="btn btn-sm btn-link p-0 me-1" onclick="editItem(${idx})">&#9998;</button>`
+              + `<button type="button" class="btn btn-sm btn-link p-0 text-danger" onclick="removeItem(${idx})">&times;</button></td></tr>`;
+    });
+    document.getElementById('item_tbody').innerHTML = html;
+    document.getElementById('g_total_disp').innerText = gTotal.toFixed(0);
+    // খসড়া না থাকলে আগের মতো পুরো লিস্ট ফর্মের সাথে যায়
+    document.getElementById('hidden_json').value = draftId ? '' : JSON.stringify(itemList);
+}
+
+// ডাউনলোডের পর পরের বার নতুন খসড়া শুরু হবে (খসড়াটা সার্ভারে থেকে যায়, পরে নিজে মুছে যায়)
+function finishDraft() {
+    if(draftId) localStorage.removeItem(draftKey());
+}
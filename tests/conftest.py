@@ -0,0 +1,29 @@
+import os, sys, tempfile
+
+import pytest
+
+# app ইমপোর্টের সময়ই init_db চলে, তাই আসল ডাটাবেজ ছোঁয়ার আগে টেম্প পাথ
+os.environ.setdefault('DB_PATH', os.path.join(tempfile.mkdtemp(), 'test.db'))
+os.environ.pop('PDF_CACHE_DIR', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as shop
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    # প্রতিটি টেস্টে নতুন খালি ডাটাবেজ
+    monkeypatch.setattr(shop, 'DB_PATH', str(tmp_path / 'shop.db'))
+    shop.close_db()
+    shop.init_db()
+    # নতুন ডাটাবেজের টেবিল ভার্সন আগের টেস্টের সাথে মিলে যেতে পারে, তাই পুরনো স্ন্যাপশট বাদ
+    shop.customer_catalog.snap = shop.product_catalog.snap = None
+    yield shop.db()
+    shop.close_db()
+
+
+@pytest.fixture
+def client(db):
+    c = shop.app.test_client()
+    c.post('/login', data={'user': 'Mehedihasan', 'pass': '1234'})
+    return c
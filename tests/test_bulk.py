@@ -0,0 +1,31 @@
+import io, zipfile
+
+from conftest import shop
+
+
+def bulk_doc(c_name, **kw):
+    doc = {'doc_type': "Invoice", 'c_name': c_name, 'c_mob': "01711000000",
+           'items': [{'title': "Window", 'desc': "", 'feet': 0, 'pcs': 1, 'rate': 100, 'total': 100}]}
+    doc.update(kw)
+    return doc
+
+
+def test_submit_failure_becomes_an_error_entry(client, monkeypatch):
+    submit = shop.submit_render
+    def flaky(doc):
+        if doc['c_name'] == "B": raise RuntimeError("pool is gone")
+        return submit(doc)
+    monkeypatch.setattr(shop, 'submit_render', flaky)
+    r = client.post('/api/bulk', json=[bulk_doc("A"), bulk_doc("B"), bulk_doc("C")])
+    z = zipfile.ZipFile(io.BytesIO(r.data))
+    assert sorted(z.namelist()) == ["001_Invoice_A.pdf", "002_error.txt", "003_Invoice_C.pdf"]
+    assert b"pool is gone" in z.read("002_error.txt")
+
+
+def test_non_string_item_text_is_rejected_before_numbering(client, db):
+    bad = bulk_doc("B", items=[{'title': "Window", 'desc': 5, 'feet': 0, 'pcs': 1, 'rate': 100, 'total': 100}])
+    r = client.post('/api/bulk', json=[bulk_doc("A"), bad])
+    assert r.status_code == 400 and "document 2: item 1" in r.get_json()['error']
+    r = client.post('/api/bulk', json=[bulk_doc("A", items=[{'title': ["W"], 'feet': 0, 'pcs': 1, 'rate': 1, 'total': 1}])])
+    assert r.status_code == 400
+    assert db.execute("SELECT COUNT(*) FROM documents").fetchone()[0] == 0
@@ -0,0 +1,67 @@
+from conftest import shop
+
+
+def item(title, total):
+    return {'title': title, 'desc': '', 'feet': 0, 'pcs': 1, 'rate': total, 'total': total}
+
+
+def new_draft(n):
+    draft = shop.create_draft('Quotation', "Customer", "01711000000")
+    ids = [shop.add_draft_item(draft['id'], item(f"item {i}", 100 * i))[0]['id'] for i in range(1, n + 1)]
+    return draft['id'], ids
+
+
+def order(draft_id):
+    return [it['id'] for it in shop.get_draft(draft_id)['items']]
+
+
+def test_repeated_moves_into_one_gap_keep_order(db):
+    # আগে সামনে/পেছনে সরিয়ে pos ছড়িয়ে দেয়া, তারপর একই ফাঁকে বারবার - ভগ্নাংশ ফুরালে রিনাম্বার হয়,
+    # তার পরেও ক্রম ঠিক থাকতে হবে
+    draft_id, ids = new_draft(6)
+    moves = [(ids[5], None), (ids[4], None), (ids[0], ids[5]), (ids[1], ids[3])]
+    moves += [(ids[3] if n % 2 == 0 else ids[2], ids[4]) for n in range(65)]
+    expected = list(ids)
+    for n, (moving, after) in enumerate(moves):
+        expected.remove(moving)
+        expected.insert(0 if after is None else expected.index(after) + 1, moving)
+        assert shop.move_draft_item(draft_id, moving, after) is not None
+        assert order(draft_id) == expected, n
+    positions = [r[0] for r in db.execute("SELECT pos FROM draft_items WHERE draft_id = ? ORDER BY pos", (draft_id,))]
+    assert len(set(positions)) == len(positions)
+
+
+def test_move_to_front_and_back(db):
+    draft_id, ids = new_draft(4)
+    shop.move_draft_item(draft_id, ids[3], None)
+    shop.move_draft_item(draft_id, ids[0], ids[2])
+    assert order(draft_id) == [ids[3], ids[1], ids[2], ids[0]]
+    assert shop.move_draft_item(draft_id, ids[0], 10**9) is None
+    assert shop.move_draft_item('missing', ids[0], None) is None
+
+
+def test_totals_follow_item_changes(db):
+    draft_id, ids = new_draft(3)
+    assert shop.get_draft(draft_id)['total'] == 600 and shop.get_draft(draft_id)['n_items'] == 3
+    _, summary = shop.update_draft_item(draft_id, ids[1], {'total': 250.5})
+    assert summary['total'] == 650.5 and summary['n_items'] == 3
+    summary = shop.remove_draft_item(draft_id, ids[0])
+    assert summary['total'] == 550.5 and summary['n_items'] == 2
+    shop.move_draft_item(draft_id, ids[2], None)
+    draft = shop.get_draft(draft_id)
+    assert draft['total'] == sum(it['total'] for it in draft['items']) == 550.5
+    assert draft['n_items'] == len(draft['items']) == 2
+    assert shop.remove_draft_item(draft_id, ids[0]) is None
+    assert shop.get_draft(draft_id)['total'] == 550.5
+
+
+def test_draft_api_round_trip(client):
+    draft = client.post('/api/drafts', json={'doc_type': 'Invoice', 'c_name': "Customer", 'c_mob': "01711000000"}).get_json()
+    url = f"/api/drafts/{draft['id']}"
+    a = client.post(f"{url}/items", json=item("a", 100)).get_json()
+    b = client.post(f"{url}/items", json=item("b", 200)).get_json()
+    assert b['draft']['total'] == 300
+    moved = client.post(f"{url}/items/{b['item']['id']}/move", json={'after': None}).get_json()
+    assert moved['draft']['total'] == 300
+    assert [it['title'] for it in client.get(url).get_json()['items']] == ["b", "a"]
+    assert client.delete(f"{url}/items/{a['item']['id']}").get_json()['draft']['total'] == 200
@@ -0,0 +1,29 @@
+import os, signal, time
+
+from conftest import shop
+
+
+def doc():
+    return {'items': [{'title': "Window", 'desc': "", 'feet': 0, 'pcs': 1, 'rate': 100, 'total': 100}],
+            'doc_type': "Invoice", 'c_name': "Rahim", 'c_mob': "01711000000", 'adv': 0, 'note': "", 'doc_date': "01/01/2026"}
+
+
+def wait_job(job_id):
+    for _ in range(300):
+        job = shop.get_job(job_id)
+        if job['status'] != 'pending': return job
+        time.sleep(0.05)
+    return job
+
+
+def test_jobs_recover_from_a_killed_pool_process(db):
+    assert wait_job(shop.enqueue_job(doc()))['status'] == 'done'
+    # পুলের একটা প্রসেস OOM এ মারা গেলে
+    pool = shop.pdf_pool()
+    os.kill(next(iter(pool._processes)), signal.SIGKILL)
+    for _ in range(100):
+        if pool._broken: break
+        time.sleep(0.05)
+    assert wait_job(shop.enqueue_job(doc()))['status'] == 'done'
+    assert shop.pdf_pool() is not pool
+    assert shop.pending_jobs() == 0
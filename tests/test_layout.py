@@ -0,0 +1,31 @@
+from conftest import shop
+
+
+def wrap(text, max_w=225):
+    return shop.wrap_lines(text, shop.DESC_FONT, shop.DESC_SIZE, max_w)[0]
+
+
+def test_spacing_is_kept_as_typed():
+    assert wrap("  W  x  H\n\tindent") == ("  W  x  H", "\tindent")
+
+
+def test_spaces_at_a_wrap_point_are_dropped():
+    assert wrap("aaa bbb ccc   ddd eee", 40) == ("aaa bbb", "ccc", "ddd eee")
+
+
+def test_long_note_continues_on_next_pages(monkeypatch):
+    canvas = shop.reportlab()[0].Canvas
+    drawn, pages = [], []
+    draw, rect, show = canvas.drawString, canvas.rect, canvas.showPage
+    monkeypatch.setattr(canvas, 'drawString', lambda c, x, y, text, *a, **k: (drawn.append((c.getPageNumber(), y, text)), draw(c, x, y, text, *a, **k))[1])
+    monkeypatch.setattr(canvas, 'rect', lambda c, x, y, w, h, *a, **k: (drawn.append((c.getPageNumber(), y, None)), rect(c, x, y, w, h, *a, **k))[1])
+    monkeypatch.setattr(canvas, 'showPage', lambda c: (pages.append(c.getPageNumber()), show(c))[1])
+    note = "\n".join(f"line {i}" for i in range(150))
+    items = [{'title': "Window", 'desc': "", 'feet': 0, 'pcs': 1, 'rate': 100, 'total': 100}]
+    shop.generate_pdf(items, "Invoice", "Rahim", "01711000000", 0, note)
+    assert len(pages) >= 2
+    # সিগনেচারের জায়গায় (PAGE_BOTTOM এর নিচে) নোটের কিছুই আঁকা হয় না
+    assert all(y >= shop.PAGE_BOTTOM for _, y, text in drawn if text is None or text.startswith("line "))
+    note_drawn = [text for _, _, text in drawn if text and text.startswith("line ")]
+    assert note_drawn == note.split("\n")
+    assert "Note (continued):" in [text for _, _, text in drawn]
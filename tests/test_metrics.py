@@ -0,0 +1,29 @@
+import json
+
+from conftest import shop
+
+
+def test_unknown_doc_type_is_labelled_other(monkeypatch):
+    monkeypatch.setattr(shop, 'metrics', shop.Metrics())
+    items = [{'title': "Window", 'desc': "", 'feet': 0, 'pcs': 1, 'rate': 100, 'total': 100}]
+    shop.generate_pdf(items, 'In"v\\x', "Rahim", "01711000000", 0, "")
+    text = shop.render_metrics()
+    assert 'pdf_documents_total{doc_type="other"} 1' in text
+    assert 'In"v' not in text
+
+
+def test_label_values_are_escaped():
+    assert shop.label_value('a\\b"c\nd') == 'a\\\\b\\"c\\nd'
+
+
+def test_dead_worker_snapshots_are_folded_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(shop, 'METRICS_DIR', str(tmp_path))
+    monkeypatch.setattr(shop, 'metrics', shop.Metrics())
+    dead = shop.Metrics()
+    dead.inc('pdf_documents_total', (('doc_type', 'Invoice'),), 3)
+    for pid in (2 ** 22 + 1, 2 ** 22 + 2): # pid_max এর বাইরে, তাই কোনো জীবিত প্রসেস নয়
+        (tmp_path / f"{pid}.json").write_text(json.dumps(dead.snapshot()))
+    shop.metrics.inc('pdf_documents_total', (('doc_type', 'Invoice'),))
+    for _ in range(2):
+        assert 'pdf_documents_total{doc_type="Invoice"} 7' in shop.render_metrics()
+    assert sorted(p.name for p in tmp_path.glob('*.json')) == sorted([f"{shop.os.getpid()}.json", 'retired.json'])
@@ -0,0 +1,30 @@
+import sqlite3
+
+from conftest import shop
+
+
+def test_upgrade_v1_database_without_archive(tmp_path, monkeypatch):
+    # user-001 এর ডাটাবেজ: শুধু customers / products, documents টেবিলই নেই
+    path = str(tmp_path / 'v1.db')
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE customers (id INTEGER PRIMARY KEY, n TEXT NOT NULL, m TEXT NOT NULL);
+        CREATE TABLE products (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+        INSERT INTO customers (n, m) VALUES ('Rahim', '01711000000'), ('Rahim 2', '+880 1711-000000');
+        INSERT INTO products (name) VALUES ('Sliding Door');
+        PRAGMA user_version = 1;
+    """)
+    conn.close()
+    monkeypatch.setattr(shop, 'DB_PATH', path)
+    shop.close_db()
+    try:
+        shop.init_db()
+        conn = shop.db()
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == shop.SCHEMA_VERSION
+        cols = [r[1] for r in conn.execute("PRAGMA table_info(documents)")]
+        assert 'token' in cols and 'status' in cols and 'content_key' not in cols
+        assert conn.execute("SELECT m_key FROM customers ORDER BY id").fetchall() == [('01711000000',), (None,)]
+        # আবার চালালে কিছু বদলায় না
+        shop.init_db()
+    finally:
+        shop.close_db()
@@ -0,0 +1,95 @@
+import json
+import re
+
+from conftest import shop
+
+
+def issue_token(client):
+    page = client.get('/create/Invoice').get_data(as_text=True)
+    return re.search(r'name="issue_token" value="(\w+)"', page).group(1)
+
+
+def download(client, token, items, note="", finalize=True, adv=0):
+    data = {'items_data': json.dumps(items), 'c_name': "Rahim", 'c_mob': "01711000000", 'adv': str(adv), 'note': note, 'issue_token': token}
+    if finalize: data['finalize'] = '1'
+    return client.post('/create/Invoice', data=data)
+
+
+def window(total, title="Window"):
+    return [{'title': title, 'desc': "", 'feet': 0, 'pcs': 2, 'rate': total / 2, 'total': total}]
+
+
+def today():
+    return shop.sales_summary('Invoice')['today']
+
+
+def assert_matches_rebuild(db):
+    # ডেল্টা দিয়ে জমা যোগফল = আর্কাইভ থেকে নতুন করে হিসাব
+    before = {t: sorted(db.execute(f"SELECT * FROM {t}").fetchall()) for t in shop.SALES_TABLES}
+    shop.rebuild_sales(db)
+    assert {t: sorted(db.execute(f"SELECT * FROM {t}").fetchall()) for t in shop.SALES_TABLES} == before
+
+
+def test_redownloading_an_edited_invoice_keeps_totals(client, db):
+    token = issue_token(client)
+    r = download(client, token, window(1200))
+    assert r.status_code == 200 and r.data[:4] == b'%PDF'
+    assert today()['total'] == 1200 and today()['docs'] == 1
+    # নোটের টাইপো ঠিক করে আবার ডাউনলোড: একই নম্বর, যোগফল দ্বিগুণ হবে না
+    r = download(client, token, window(1200), note="one year warranty")
+    assert 'Invoice_200.pdf' in r.headers['Content-Disposition']
+    assert today()['total'] == 1200 and today()['docs'] == 1
+    # দাম ও প্রোডাক্ট বদলে সংশোধন: পুরনোটা বাদ, নতুনটা যোগ
+    download(client, token, window(1500, "Door"), adv=500)
+    assert today() == {'docs': 1, 'total': 1500, 'advance': 500, 'due': 1000}
+    assert [p['name'] for p in shop.sales_summary('Invoice')['top_products']] == ["Door"]
+    assert_matches_rebuild(db)
+
+
+def test_new_token_is_a_new_sale(client):
+    r1 = download(client, issue_token(client), window(1200))
+    r2 = download(client, issue_token(client), window(1200))
+    assert 'Invoice_200.pdf' in r1.headers['Content-Disposition'] and 'Invoice_201.pdf' in r2.headers['Content-Disposition']
+    assert today()['total'] == 2400 and today()['docs'] == 2
+
+
+def test_only_finalized_documents_are_counted(client):
+    download(client, issue_token(client), window(1200), finalize=False)
+    assert today()['docs'] == 0
+    assert client.post('/api/documents/Invoice/200/finalize').get_json()['status'] == 'final'
+    assert client.post('/api/documents/Invoice/200/finalize').get_json()['status'] == 'final'
+    assert today()['total'] == 1200 and today()['docs'] == 1
+
+
+def test_failed_render_is_not_counted(client, monkeypatch, db):
+    r = download(client, issue_token(client), [{'title': "Window", 'pcs': 1, 'rate': 100, 'total': 100}])
+    assert r.status_code == 400
+    assert db.execute("SELECT COUNT(*) FROM documents").fetchone()[0] == 0
+
+    def broken(*args, **kwargs): raise RuntimeError("render failed")
+    monkeypatch.setattr(shop, 'generate_pdf', broken)
+    r = download(client, issue_token(client), window(999))
+    assert b'render failed' in r.data
+    assert today()['docs'] == 0
+    assert db.execute("SELECT status FROM documents").fetchall() == [('open',)]
+
+
+def test_void_subtracts_the_document(client, db):
+    download(client, issue_token(client), window(1200))
+    download(client, issue_token(client), window(300, "Door"))
+    assert client.post('/api/documents/Invoice/200/void').get_json()['status'] == 'void'
+    assert today()['total'] == 300 and today()['docs'] == 1
+    assert [p['name'] for p in shop.sales_summary('Invoice')['top_products']] == ["Door"]
+    # বাতিল ডকুমেন্ট আর ফাইনাল বা সংশোধন হয় না
+    assert client.post('/api/documents/Invoice/200/finalize').status_code == 409
+    assert client.post('/api/documents/Invoice/999/void').status_code == 404
+    assert_matches_rebuild(db)
+
+
+def test_unknown_doc_type_is_not_issued(client, db):
+    assert client.get('/create/Foo').status_code == 404
+    items = [{'title': "Window", 'desc': "", 'feet': 0, 'pcs': 1, 'rate': 100, 'total': 100}]
+    r = client.post('/create/Foo', data={'items_data': json.dumps(items), 'c_name': "Rahim", 'c_mob': "01711000000", 'note': ""})
+    assert r.status_code == 404
+    assert client.post('/api/bulk', json=[{'doc_type': "Foo", 'c_name': "Rahim", 'c_mob': "017", 'items': items}]).status_code == 400
+    assert db.execute("SELECT COUNT(*) FROM doc_counters").fetchone()[0] == 0
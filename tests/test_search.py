@@ -0,0 +1,20 @@
+from conftest import shop
+
+
+def names(q):
+    return [c['n'] for c in shop.search_customers(q)]
+
+
+def test_digits_in_a_name_are_not_a_mobile(db):
+    shop.add_customer("Flat 1 Owner", "01811000000")
+    shop.add_customer("Rahim", "01711000000")
+    assert names("Karim 1") == []
+    assert names("Flat 1") == ["Flat 1 Owner"]
+
+
+def test_mobile_prefix_search(db):
+    shop.add_customer("Rahim", "01711000000")
+    shop.add_customer("Karim", "01811000000")
+    assert names("+880 1711") == names("0171") == ["Rahim"]
+    # অসম্পূর্ণ নম্বরের কাস্টমার মোবাইল সার্চে আসে না
+    assert names("01") == [] and names("017") == ["Rahim"]